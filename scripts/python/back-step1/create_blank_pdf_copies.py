@@ -1,8 +1,18 @@
 import os
-import PyPDF2
-from PyPDF2 import PdfReader, PdfWriter
-import time
+import io
 import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from PyPDF2 import PdfWriter
+import fitz  # PyMuPDF
+
+try:
+    import fcntl
+except ImportError:  # Windows has no fcntl, so reflinks fall back to copies
+    fcntl = None
+
+FICLONE = 0x40049409  # Linux ioctl that shares extents between files (Btrfs, XFS)
+COPY_METHODS = ('copy', 'hardlink', 'reflink')
 
 def print_welcome_message():
     welcome_text = """
@@ -34,6 +44,8 @@ def print_welcome_message():
     ✦ These blank PDFs are crucial for maintaining consistent file naming between front and back designs.
     ✦ The blank PDFs will later be combined with backgrounds and replaced with QR codes in subsequent steps.
     ✦ This script does not modify the original files in any way.
+    ✦ Only one blank page is generated per distinct page size; every other blank
+      PDF is a copy of it (or a hardlink/reflink if you choose that option).
 
     Let's begin creating the blank PDF copies for your card backs!
     """
@@ -87,15 +99,98 @@ def create_blank_template(width, height):
     writer.add_blank_page(width=width, height=height)
     return writer
 
-def duplicate_blank_pdf(template, output_path):
-    with open(output_path, 'wb') as output_file:
-        template.write(output_file)
+def serialize_blank_template(width, height):
+    """Return the bytes of a one-page blank PDF of the given size."""
+    buffer = io.BytesIO()
+    create_blank_template(width, height).write(buffer)
+    return buffer.getvalue()
 
 def get_pdf_dimensions(pdf_path):
-    with open(pdf_path, 'rb') as file:
-        reader = PdfReader(file)
-        page = reader.pages[0]
-        return page.mediabox.width, page.mediabox.height
+    """
+    Read the first page's mediabox with PyMuPDF, without parsing the page contents.
+    
+    Returns:
+    tuple: (width, height) in points, rounded so equal sizes group together.
+    """
+    with fitz.open(pdf_path) as doc:
+        mediabox = doc[0].mediabox
+        return round(mediabox.width, 3), round(mediabox.height, 3)
+
+def reflink(source_path, output_path):
+    """Clone source into output so both share the same data blocks on disk."""
+    with open(source_path, 'rb') as source, open(output_path, 'wb') as output:
+        fcntl.ioctl(output.fileno(), FICLONE, source.fileno())
+
+def duplicate_blank_pdf(template_bytes, template_path, output_path, method='copy'):
+    """
+    Write one blank PDF from its size's template.
+    
+    Args:
+    template_bytes (bytes): The serialized blank template.
+    template_path (str): The first output written for this size, used as the link source.
+    output_path (str): Path of the blank PDF to create.
+    method (str): 'copy' writes the bytes, 'hardlink' or 'reflink' link to template_path.
+                  Links fall back to a plain copy where the filesystem does not support them.
+    """
+    if os.path.exists(output_path):
+        os.remove(output_path)
+    try:
+        if method == 'hardlink':
+            os.link(template_path, output_path)
+            return
+        if method == 'reflink' and fcntl is not None:
+            reflink(template_path, output_path)
+            return
+    except OSError:
+        pass
+    with open(output_path, 'wb') as output_file:
+        output_file.write(template_bytes)
+
+def create_blank_copies(original_directory, output_directory, pdf_files, method='copy', workers=None):
+    """
+    Create a blank PDF for every original, serializing only one template per page size.
+    
+    Args:
+    original_directory (str): Directory with the original PDFs.
+    output_directory (str): Directory to write the blank PDFs into.
+    pdf_files (list): Filenames of the original PDFs.
+    method (str): How each blank PDF is written; see duplicate_blank_pdf.
+    workers (int, optional): Number of threads for writing copies and links.
+    
+    Returns:
+    dict: Maps each (width, height) to the filenames created at that size.
+    """
+    workers = workers or min(32, (os.cpu_count() or 1) * 4)
+    total_files = len(pdf_files)
+    loader = loading_animation()
+    sizes = defaultdict(list)
+
+    # Read every page size first, sequentially: PyMuPDF is not thread-safe, and reading a mediabox is cheap
+    for i, filename in enumerate(pdf_files, 1):
+        sizes[get_pdf_dimensions(os.path.join(original_directory, filename))].append(filename)
+        sys.stdout.write(f"\rReading page sizes: {next(loader)} {i}/{total_files} " +
+                         f"({i/total_files*100:.1f}%)")
+        sys.stdout.flush()
+    print()
+
+    # Threads only copy bytes or create links, which never touch PyMuPDF
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Write one template per size, then copy or link the rest from it
+        futures = []
+        for (width, height), filenames in sizes.items():
+            template_bytes = serialize_blank_template(width, height)
+            template_path = os.path.join(output_directory, filenames[0])
+            duplicate_blank_pdf(template_bytes, template_path, template_path, 'copy')
+            futures.extend(executor.submit(duplicate_blank_pdf, template_bytes, template_path,
+                                           os.path.join(output_directory, filename), method)
+                           for filename in filenames[1:])
+        for i, future in enumerate(as_completed(futures), len(sizes) + 1):
+            future.result()
+            sys.stdout.write(f"\rCreating blank PDFs: {next(loader)} {i}/{total_files} " +
+                             f"({i/total_files*100:.1f}%)")
+            sys.stdout.flush()
+
+    return sizes
 
 def loading_animation():
     animation = "|/-\\"
@@ -129,28 +224,16 @@ def main():
         print("Error: No PDF files found in the original directory.")
         return
     
-    # Process each file in the original directory
-    total_files = len(pdf_files)
-    loader = loading_animation()
-    for i, filename in enumerate(pdf_files, 1):
-        original_path = os.path.join(original_directory, filename)
-        output_path = os.path.join(output_directory, filename)
-        
-        # Get dimensions for this specific PDF
-        width, height = get_pdf_dimensions(original_path)
-        
-        # Create a blank template with these dimensions
-        template = create_blank_template(width, height)
-        
-        # Create the blank PDF
-        duplicate_blank_pdf(template, output_path)
-        
-        # Update loading animation
-        sys.stdout.write(f"\rProcessing: {next(loader)} {i}/{total_files} " +
-                         f"({i/total_files*100:.1f}%)")
-        sys.stdout.flush()
-        time.sleep(0.1)  # Small delay to make the animation visible
+    method = input("How should the blank copies be written? 'copy' (default), 'hardlink' or 'reflink': ").strip().lower() or 'copy'
+    if method not in COPY_METHODS:
+        print(f"Error: Unknown method '{method}'. Choose one of: {', '.join(COPY_METHODS)}.")
+        return
 
+    # Process each file in the original directory
+    sizes = create_blank_copies(original_directory, output_directory, pdf_files, method)
+    print(f"\nUsed {len(sizes)} blank template(s) for {len(pdf_files)} files:")
+    for (width, height), filenames in sizes.items():
+        print(f"  {width} x {height} pt: {len(filenames)} files")
     print("\nAll blank PDFs have been created.")
     print_concluding_message()
 
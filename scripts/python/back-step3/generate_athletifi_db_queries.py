@@ -1,9 +1,16 @@
 import csv
 import os
 from collections import defaultdict
+from itertools import islice
+import sys
 import uuid
 import datetime
 
+# Parsed cards can come from the card catalog that parse_filenames.py fills
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+from card_catalog import load_parsed_cards
+from athletifi_db import AthletifiDatabase, DATABASE_URL_VARIABLE, default_database_url, execute_values, fetch_rows, parameterized
+
 def sanitize_path(input_path):
     sanitized = input_path.strip('\'"').replace("\\ ", " ").strip()
     if os.path.exists(sanitized):
@@ -11,23 +18,21 @@ def sanitize_path(input_path):
     else:
         raise FileNotFoundError(f"Not a valid file path: {sanitized}. Please try again.")
 
-def group_filenames_by_player(csv_path):
+def group_filenames_by_player(csv_path, collection_name):
     player_groups = defaultdict(list)
-    with open(csv_path, 'r') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            # Split the name if it contains a hyphen
-            names = row['first_name'].split('-')
-            if len(names) > 1:
-                first_name = names[0]
-                last_name = '-'.join(names[1:])
-            else:
-                first_name = row['first_name']
-                last_name = row['last_name']
-            
-            # Combine first and last name
-            full_name = f"{first_name} {last_name}".strip()
-            player_groups[full_name].append(row)
+    for row in load_parsed_cards(csv_path, collection_name):
+        # Split the name if it contains a hyphen
+        names = row['first_name'].split('-')
+        if len(names) > 1:
+            first_name = names[0]
+            last_name = '-'.join(names[1:])
+        else:
+            first_name = row['first_name']
+            last_name = row['last_name']
+        
+        # Combine first and last name
+        full_name = f"{first_name} {last_name}".strip()
+        player_groups[full_name].append(row)
     return player_groups
 
 def get_existing_records(csv_path):
@@ -38,22 +43,41 @@ def get_existing_records(csv_path):
             existing_records[row['full_name']] = row
     return existing_records
 
-def generate_get_highest_slug_query(collection_name):
+def sql_literal(value):
+    """Quote a value as an SQL string literal."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+# Created by scripts/sql/migrations/001_collection_slug_counters.sql
+SLUG_COUNTER_TABLE = "public.collection_slug_counters"
+
+def generate_allocate_slugs_query(collection_name, slug_count, literal=sql_literal):
+    """
+    Reserve a contiguous block of `slug_count` dashboard slug numbers for a collection on the server.
+    
+    Each collection has a counter row holding its last reserved slug number, kept ahead of every
+    slug in use by the migration's triggers. The reservation is a single upsert that locks the
+    counter row, so concurrent runs on the same collection always get separate blocks, and a new
+    collection starts at 1. Slugs reserved by a run that is never executed are simply left unused.
+    """
     return f"""
-    SELECT COALESCE(MAX(CAST(SUBSTRING(dashboard_slug FROM '{collection_name}/([0-9]+)$') AS INTEGER)), 0) as max_slug
-    FROM public.player_card_images
-    WHERE dashboard_slug LIKE '{collection_name}/%';
+    INSERT INTO {SLUG_COUNTER_TABLE} AS counters (collection, last_slug)
+    VALUES ({literal(collection_name)}, {slug_count})
+    ON CONFLICT (collection) DO UPDATE SET last_slug = counters.last_slug + EXCLUDED.last_slug
+    RETURNING last_slug - {slug_count} + 1 AS first_slug;
     """
 
-def generate_check_and_create_competition_query(competition_name):
+def count_new_cards(player_groups, existing_players):
+    return sum(len(cards) for player, cards in player_groups.items() if player not in existing_players)
+
+def generate_check_and_create_competition_query(competition_name, literal=sql_literal):
     return f"""
     WITH competition_check AS (
         SELECT competition_id
         FROM competitions
-        WHERE name = '{competition_name}'
+        WHERE name = {literal(competition_name)}
     ), new_competition AS (
         INSERT INTO competitions (competition_id, name)
-        SELECT gen_random_uuid(), '{competition_name}'
+        SELECT gen_random_uuid(), {literal(competition_name)}
         WHERE NOT EXISTS (SELECT 1 FROM competition_check)
         RETURNING competition_id
     )
@@ -63,17 +87,16 @@ def generate_check_and_create_competition_query(competition_name):
     ) AS competition_id
     """
 
-def generate_check_collection_query(collection_name):
+def generate_check_collection_query(collection_name, literal=sql_literal):
     return f"""
     SELECT COUNT(*) as record_count
     FROM public.player_card_images
-    WHERE dashboard_slug LIKE '{collection_name}/%';
+    WHERE dashboard_slug LIKE {literal(collection_name + '/%')};
     """
 
-def generate_check_specific_players_query(collection_name, player_list):
+def generate_check_specific_players_query(collection_name, player_list, literal=sql_literal):
     # Clean up player names: remove hyphens, trim spaces
     cleaned_players = [name.replace('-', ' ').strip() for name in player_list]
-    player_names = ", ".join([f"'{name}'" for name in cleaned_players])
     
     return f"""
     SELECT DISTINCT ON (p.player_first_name, p.player_last_name)
@@ -87,30 +110,31 @@ def generate_check_specific_players_query(collection_name, player_list):
         players_team_info pti ON pci.player_id = pti.player_id
     JOIN
         player_identities p ON pti.player_identity = p.id
+    {players_join('p', cleaned_players, lowercase=True, literal=literal)}
     WHERE
-        pci.dashboard_slug LIKE '{collection_name}%'
-        AND LOWER(TRIM(p.player_first_name || ' ' || p.player_last_name)) IN 
-            (SELECT LOWER(TRIM(unnest(ARRAY[{player_names}]))))
+        pci.dashboard_slug LIKE {literal(collection_name + '%')}
     ORDER BY
         p.player_first_name, p.player_last_name, pci.dashboard_slug;
     """
 
-def generate_create_missing_records_query(player_groups, existing_players):
-    queries = []
+def iter_new_players(player_groups, existing_players):
+    """Yield (first name, last name, jersey number) for every player not in the database yet, in input order."""
     for player, cards in player_groups.items():
         if player not in existing_players:
             first_name, last_name = player.split(' ', 1)
-            jersey_number = cards[0]['jersey_number']
-            
-            queries.append(f"""
+            yield first_name, last_name, cards[0]['jersey_number']
+
+def create_player_query(first_name, last_name, jersey_number):
+    first_name, last_name, jersey_number = sql_literal(first_name), sql_literal(last_name), sql_literal(jersey_number)
+    return f"""
             WITH existing_identity AS (
                 SELECT id
                 FROM player_identities
-                WHERE player_first_name = '{first_name}' AND player_last_name = '{last_name}'
+                WHERE player_first_name = {first_name} AND player_last_name = {last_name}
             ),
             new_identity AS (
                 INSERT INTO player_identities (player_first_name, player_last_name)
-                SELECT '{first_name}', '{last_name}'
+                SELECT {first_name}, {last_name}
                 WHERE NOT EXISTS (SELECT 1 FROM existing_identity)
                 RETURNING id
             ),
@@ -126,7 +150,7 @@ def generate_create_missing_records_query(player_groups, existing_players):
             ),
             new_player AS (
                 INSERT INTO players_team_info (player_identity, player_number)
-                SELECT (SELECT id FROM identity_id), '{jersey_number}'
+                SELECT (SELECT id FROM identity_id), {jersey_number}
                 WHERE NOT EXISTS (SELECT 1 FROM existing_player)
                 RETURNING player_id
             ),
@@ -137,62 +161,224 @@ def generate_create_missing_records_query(player_groups, existing_players):
             )
             SELECT player_id
             FROM player_id;
-            """)
-    
-    return queries
-
-def generate_insert_card_images_query(player_groups, collection_name, team_name, existing_players, next_slug_number):
-    queries = []
+            """
 
+def iter_card_images(player_groups, collection_name, existing_players, next_slug_number):
+    """
+    Assign an image URL and dashboard slug to every card of the new players, in insert order.
+    
+    Yields:
+    tuple: (first name, last name, card image URL, dashboard slug) for each card.
+    """
     for player, cards in player_groups.items():
         if player not in existing_players:
             first_name, last_name = player.split(' ', 1)
             for card in cards:
                 card_image_url = f"https://athletifi-s3.s3.us-east-2.amazonaws.com/player-card-images/{collection_name}/{card['webp_filename']}"
                 dashboard_slug = f"{collection_name}/{next_slug_number}"
-
-                queries.append(f"""
-                INSERT INTO player_card_images (player_id, competition_id, card_image_url, dashboard_slug)
-                SELECT 
-                    (SELECT pti.player_id 
-                     FROM players_team_info pti
-                     JOIN player_identities pi ON pti.player_identity = pi.id
-                     WHERE pi.player_first_name = '{first_name}' 
-                     AND pi.player_last_name = '{last_name}'),
-                    @competition_id,
-                    '{card_image_url}',
-                    '{dashboard_slug}'
-                ON CONFLICT (dashboard_slug) DO NOTHING;
-                -- Note: Conflicts indicate existing records and require manual investigation
-                """)
+                yield first_name, last_name, card_image_url, dashboard_slug
                 next_slug_number += 1
 
-    return queries, next_slug_number
+def insert_card_image_query(first_name, last_name, card_image_url, dashboard_slug):
+    """Return one statement inserting a single card image for its player; see insert_card_images_query_from."""
+    return insert_card_images_query_from(f"""(
+        VALUES ({sql_literal(first_name)}, {sql_literal(last_name)}, {sql_literal(card_image_url)}, {sql_literal(dashboard_slug)}, 0)
+    ) AS c (first_name, last_name, card_image_url, dashboard_slug, ord)""")
+
+# Rows per multi-row VALUES list in bulk mode, to keep each statement a manageable size
+BULK_ROWS = 1000
+
+def values_list(rows, indent="        ", literal=sql_literal):
+    """Format rows of values as the body of a multi-row VALUES list, quoting strings with `literal`."""
+    return (",\n" + indent).join("(" + ", ".join(literal(value) if isinstance(value, str) else str(value) for value in row) + ")"
+                                  for row in rows)
+
+def chunks(rows, size=BULK_ROWS):
+    """Yield (offset, list) slices of up to `size` rows from any iterable, without materializing it."""
+    rows = iter(rows)
+    start = 0
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+def player_name_pairs(full_names, lowercase=False):
+    """
+    Split full names into (first name, last name) pairs for joining against player_identities.
+    
+    A name is split at every space, since either name can contain spaces; each pair matches
+    exactly the identities whose first and last name joined by a space give the full name.
+    """
+    pairs = {}
+    for full_name in full_names:
+        if lowercase:
+            full_name = full_name.strip().lower()
+        parts = full_name.split(' ')
+        for i in range(1, len(parts)):
+            pairs[(' '.join(parts[:i]), ' '.join(parts[i:]))] = None
+    return list(pairs)
+
+def players_join(alias, full_names, lowercase=False, literal=sql_literal):
+    """
+    Return a JOIN of player_identities (as `alias`) against an inline VALUES list of player names.
+    
+    Matching the first and last name columns directly, instead of comparing their concatenation,
+    lets Postgres use the name indexes from scripts/sql/migrations/002_player_name_indexes.sql.
+    With `lowercase`, names match case-insensitively and ignore spaces before the first name and
+    after the last name, exactly like comparing LOWER(TRIM(first || ' ' || last)) with the trimmed
+    full name; the join uses the index on LOWER(LTRIM(player_first_name)), LOWER(RTRIM(player_last_name)).
+    """
+    pairs = player_name_pairs(full_names, lowercase)
+    # An empty VALUES list is not valid SQL; a single row of NULLs matches nothing instead
+    rows = values_list(pairs, literal=literal) if pairs else "(NULL, NULL)"
+    first_name, last_name = (f"LOWER(LTRIM({alias}.player_first_name))", f"LOWER(RTRIM({alias}.player_last_name))") if lowercase else (f"{alias}.player_first_name", f"{alias}.player_last_name")
+    return f"""JOIN (
+        VALUES
+        {rows}
+    ) AS players (first_name, last_name) ON {first_name} = players.first_name AND {last_name} = players.last_name"""
+
+def bulk_create_players_query(rows, start=0):
+    """Return one set-based statement creating the given (first name, last name, jersey number) players, numbered from `start`."""
+    rows = [row + (start + offset,) for offset, row in enumerate(rows)]
+    return create_players_query_from(values_list(rows))
+
+def create_players_query_from(values):
+    """
+    Return one set-based statement creating players that do not exist yet, in `ord` order.
+    
+    Identities and team records are looked up with a single join against the new players and
+    inserted in the same player order as the per-player queries. Jersey numbers arrive as text
+    and are converted through the players_team_info row type, so they take whatever type the
+    player_number column has, as the untyped literals of the per-player queries do.
+    
+    Args:
+    values (str): Body of a VALUES list of (first name, last name, jersey number, ord) rows.
+    """
+    return f"""
+    WITH new_players (first_name, last_name, player_number, ord) AS (
+        VALUES
+        {values}
+    ),
+    new_identities AS (
+        INSERT INTO player_identities (player_first_name, player_last_name)
+        SELECT np.first_name, np.last_name
+        FROM new_players np
+        WHERE NOT EXISTS (
+            SELECT 1 FROM player_identities pi
+            WHERE pi.player_first_name = np.first_name AND pi.player_last_name = np.last_name
+        )
+        ORDER BY np.ord
+        RETURNING id, player_first_name, player_last_name
+    ),
+    identities AS (
+        SELECT pi.id, np.player_number, np.ord
+        FROM new_players np
+        JOIN player_identities pi ON pi.player_first_name = np.first_name AND pi.player_last_name = np.last_name
+        UNION ALL
+        SELECT ni.id, np.player_number, np.ord
+        FROM new_players np
+        JOIN new_identities ni ON ni.player_first_name = np.first_name AND ni.player_last_name = np.last_name
+    )
+    INSERT INTO players_team_info (player_identity, player_number)
+    SELECT i.id, (json_populate_record(NULL::players_team_info, json_build_object('player_number', i.player_number))).player_number
+    FROM identities i
+    WHERE NOT EXISTS (SELECT 1 FROM players_team_info pti WHERE pti.player_identity = i.id)
+    ORDER BY i.ord;
+    """
+
+def bulk_insert_card_images_query(rows, start=0):
+    """Return set-based statements inserting the given card images, ordered from `start`."""
+    rows = [row + (start + offset,) for offset, row in enumerate(rows)]
+    return (check_card_players_query_for(rows)
+            + insert_card_images_query_from(f"""(
+        VALUES
+        {values_list(rows)}
+    ) AS c (first_name, last_name, card_image_url, dashboard_slug, ord)"""))
+
+def check_card_players_query_for(rows):
+    """Return check_card_players_query for card rows starting with (first name, last name)."""
+    names = list(dict.fromkeys(row[:2] for row in rows))
+    return check_card_players_query(f"(VALUES {values_list(names)}) AS c (first_name, last_name)")
+
+def check_card_players_query(cards):
+    """
+    Return a DO block that aborts the transaction if a card in `cards` has no player record.
+    
+    Args:
+    cards (str): FROM item aliased `c` with first_name and last_name columns.
+    """
+    return f"""
+    DO $$
+    DECLARE
+        unmatched TEXT;
+    BEGIN
+        SELECT string_agg(DISTINCT c.first_name || ' ' || c.last_name, ', ')
+        INTO unmatched
+        FROM {cards}
+        WHERE NOT EXISTS (
+            SELECT 1
+            FROM player_identities pi
+            JOIN players_team_info pti ON pti.player_identity = pi.id
+            WHERE pi.player_first_name = c.first_name AND pi.player_last_name = c.last_name
+        );
+        IF unmatched IS NOT NULL THEN
+            RAISE EXCEPTION USING MESSAGE = 'No player record for: ' || unmatched;
+        END IF;
+    END $$;
+    """
+
+def insert_card_images_query_from(cards):
+    """
+    Return one set-based statement inserting every card in `cards` for its player.
+    
+    Each card is joined to exactly one team record: the one with the lowest player_id among the
+    records of identities with the card's name, so a player with several team records never gets
+    the card twice, and a card without a player is left out instead of inserted with no player.
+    
+    Args:
+    cards (str): FROM item aliased `c` with first_name, last_name, card_image_url, dashboard_slug and ord columns.
+    """
+    return f"""
+    INSERT INTO player_card_images (player_id, competition_id, card_image_url, dashboard_slug)
+    SELECT p.player_id, @competition_id, c.card_image_url, c.dashboard_slug
+    FROM {cards}
+    CROSS JOIN LATERAL (
+        SELECT pti.player_id
+        FROM player_identities pi
+        JOIN players_team_info pti ON pti.player_identity = pi.id
+        WHERE pi.player_first_name = c.first_name AND pi.player_last_name = c.last_name
+        ORDER BY pti.player_id
+        LIMIT 1
+    ) AS p
+    ORDER BY c.ord
+    ON CONFLICT (dashboard_slug) DO NOTHING;
+    -- Note: Conflicts indicate existing records and require manual investigation
+    """
 
 def generate_invite_type(collection_name):
     date_suffix = datetime.datetime.now().strftime("%m%d%y")
     return f"qr_code_invite_{collection_name}-{date_suffix}"
 
-def generate_invitation_query(collection_name, invite_type, players_needing_qr):
+def generate_invitation_query(collection_name, invite_type, players_needing_qr, literal=sql_literal):
     dashboard_slug_pattern = f"%{collection_name}%"
-    players_condition = " OR ".join([f"pi.player_first_name || ' ' || pi.player_last_name = '{player}'" for player in players_needing_qr])
     return f"""
 INSERT INTO public.invitations (guest_email, card, status, invite_type)
 SELECT 
     '-' AS guest_email,
     pci.card_image_id AS card,
     'pending' AS status,
-    '{invite_type}' AS invite_type
+    {literal(invite_type)} AS invite_type
 FROM public.player_card_images pci
 JOIN public.players_team_info pti ON pci.player_id = pti.player_id
 JOIN public.player_identities pi ON pti.player_identity = pi.id
-WHERE pci.dashboard_slug LIKE '{dashboard_slug_pattern}'
-AND ({players_condition})
+{players_join('pi', players_needing_qr, literal=literal)}
+WHERE pci.dashboard_slug LIKE {literal(dashboard_slug_pattern)}
 ON CONFLICT DO NOTHING;
 """
 
-def generate_qr_redirect_query(invite_type, players_needing_qr):
-    players_condition = " OR ".join([f"pi.player_first_name || ' ' || pi.player_last_name = '{player}'" for player in players_needing_qr])
+def generate_qr_redirect_query(invite_type, players_needing_qr, literal=sql_literal):
     return f"""
 INSERT INTO public.qr_redirects (invite_id)
 SELECT i.invite_id
@@ -200,12 +386,17 @@ FROM public.invitations i
 JOIN public.player_card_images pci ON i.card = pci.card_image_id
 JOIN public.players_team_info pti ON pci.player_id = pti.player_id
 JOIN public.player_identities pi ON pti.player_identity = pi.id
-WHERE i.invite_type = '{invite_type}'
-AND ({players_condition})
+{players_join('pi', players_needing_qr, literal=literal)}
+WHERE i.invite_type = {literal(invite_type)}
 ON CONFLICT DO NOTHING;
 """
 
-def generate_view_query(collection_name, highest_slug_number):
+def generate_view_query(collection_name, highest_slug_number, last_slug_number=None, literal=sql_literal):
+    # With a last slug number, only the block of slugs reserved for this run is shown
+    slug_number = f"CAST(SUBSTRING(pci.dashboard_slug FROM {literal(collection_name + '/([0-9]+)$')}) AS INTEGER)"
+    upper_bound = ""
+    if last_slug_number is not None:
+        upper_bound = f"\n        AND {slug_number} <= {last_slug_number}"
     return f"""
     SELECT DISTINCT ON (pci.card_image_url) 
         pci.card_image_url,
@@ -218,8 +409,8 @@ def generate_view_query(collection_name, highest_slug_number):
     LEFT JOIN 
         public.qr_redirects qr ON qr.invite_id = i.invite_id
     WHERE 
-        pci.dashboard_slug LIKE '{collection_name}/%'
-        AND CAST(SUBSTRING(pci.dashboard_slug FROM '{collection_name}/([0-9]+)$') AS INTEGER) > {highest_slug_number}
+        pci.dashboard_slug LIKE {literal(collection_name + '/%')}
+        AND {slug_number} > {highest_slug_number}{upper_bound}
     ORDER BY 
         pci.card_image_url,
         qr.qrcode_id NULLS LAST,
@@ -228,9 +419,8 @@ def generate_view_query(collection_name, highest_slug_number):
 
 
 
-def generate_qr_code_check_query(collection_name, player_list):
+def generate_qr_code_check_query(collection_name, player_list, literal=sql_literal):
     cleaned_players = [name.replace('-', ' ').strip() for name in player_list]
-    player_names = ", ".join([f"'{name}'" for name in cleaned_players])
     
     return f"""
     SELECT DISTINCT ON (pi.player_first_name, pi.player_last_name) 
@@ -242,14 +432,13 @@ def generate_qr_code_check_query(collection_name, player_list):
         public.players_team_info pti ON pci.player_id = pti.player_id
     JOIN
         public.player_identities pi ON pti.player_identity = pi.id
+    {players_join('pi', cleaned_players, lowercase=True, literal=literal)}
     LEFT JOIN 
         public.invitations i ON i.card = pci.card_image_id
     LEFT JOIN 
         public.qr_redirects qr ON qr.invite_id = i.invite_id
     WHERE 
-        pci.dashboard_slug LIKE '{collection_name}/%'
-        AND LOWER(TRIM(pi.player_first_name || ' ' || pi.player_last_name)) IN 
-            (SELECT LOWER(TRIM(unnest(ARRAY[{player_names}]))))
+        pci.dashboard_slug LIKE {literal(collection_name + '/%')}
     ORDER BY 
         pi.player_first_name, pi.player_last_name, qr.qrcode_id NULLS LAST;
     """
@@ -289,13 +478,141 @@ def parse_qr_status_csv(csv_path):
         return None
     return players_needing_qr
 
+COMPETITION_ID = "(SELECT current_setting('athletifi.competition_id')::uuid)"
+# Players or cards per transaction in the update script
+CHUNK_ROWS = 1000
+
+def competition_block(check_and_create_competition_query):
+    return "".join([
+        "-- Check if competition exists and create if it doesn't\n",
+        "DO $$\n",
+        "DECLARE\n",
+        "    comp_id UUID;\n",
+        "BEGIN\n",
+        f"    {check_and_create_competition_query}\n",
+        "    INTO comp_id;\n",
+        "    PERFORM set_config('athletifi.competition_id', comp_id::text, false);\n",
+        "END $$;\n\n",
+    ])
+
+def write_chunk(f, number, total, description, statements):
+    """Write one self-contained transaction of the update script, followed by a progress notice."""
+    f.write(f"-- Chunk {number} of {total}: {description}\n")
+    f.write("BEGIN;\n\n")
+    for statement in statements:
+        f.write(statement + "\n")
+    f.write("COMMIT;\n")
+    f.write(f"DO $$ BEGIN RAISE NOTICE 'Chunk {number} of {total} committed: {description}'; END $$;\n\n")
+
+def write_update_script(f, competition_name, player_groups, collection_name, team_name, existing_players,
+                        next_slug_number, bulk_mode=False, chunk_rows=CHUNK_ROWS):
+    """
+    Stream the update script to a file as a series of transactions of up to `chunk_rows` players or cards.
+    
+    The first transaction creates the competition; the player and card image transactions follow in
+    insert order. Every statement skips rows that already exist and every card chunk looks the
+    competition up again, so a chunk that failed can be fixed and re-run on its own once the
+    competition chunk has been committed.
+    
+    Returns:
+    int: The next slug number after the inserted cards.
+    """
+    player_count = sum(1 for _ in iter_new_players(player_groups, existing_players))
+    card_count = count_new_cards(player_groups, existing_players)
+    total = 1 + -(-player_count // chunk_rows) + -(-card_count // chunk_rows)
+    f.write(f"-- {total} transactions: competition, {player_count} new players and {card_count} card images.\n")
+    f.write("-- Each transaction can be re-run on its own after the first one has been committed.\n\n")
+
+    write_chunk(f, 1, total, "competition", [competition_block(generate_check_and_create_competition_query(competition_name))])
+    number = 1
+
+    for start, rows in chunks(iter_new_players(player_groups, existing_players), chunk_rows):
+        number += 1
+        if bulk_mode:
+            statements = [bulk_create_players_query(part, start + offset) for offset, part in chunks(rows)]
+        else:
+            statements = [create_player_query(*row) for row in rows]
+        write_chunk(f, number, total, f"players {start + 1}-{start + len(rows)}", ["-- Create missing player records"] + statements)
+
+    set_competition = (f"SELECT set_config('athletifi.competition_id', competition_id::text, false) "
+                       f"FROM competitions WHERE name = {sql_literal(competition_name)};")
+    card_images = iter_card_images(player_groups, collection_name, existing_players, next_slug_number)
+    for start, rows in chunks(card_images, chunk_rows):
+        number += 1
+        if bulk_mode:
+            statements = [bulk_insert_card_images_query(part, start + offset) for offset, part in chunks(rows)]
+        else:
+            statements = [check_card_players_query_for(rows)] + [insert_card_image_query(*row) for row in rows]
+        statements = [statement.replace("@competition_id", COMPETITION_ID) for statement in statements]
+        write_chunk(f, number, total, f"card images {start + 1}-{start + len(rows)}",
+                    [set_competition, "-- Insert or update player card images"] + statements)
+
+    return next_slug_number + card_count
+
+def run_direct(database, collection_name, competition_name, team_name, player_groups, output_folder='.'):
+    """
+    Run the whole database update for a collection directly, without pgAdmin.
+    
+    The checks, the player and card image inserts, and the invitations and QR redirects for
+    players without a QR code all run in one transaction, using the set-based bulk statements.
+    Every value is sent as a query parameter, and the player and card rows are sent with
+    execute_values, one statement per BULK_ROWS rows. The QR code check results for the new cards
+    are then exported to a CSV file.
+    
+    Args:
+    database (AthletifiDatabase): Open database connection pool.
+    output_folder (str, optional): Folder to write the QR code check CSV to.
+    
+    Returns:
+    str: Path of the exported QR code check CSV.
+    """
+    player_list = list(player_groups.keys())
+    with database.transaction() as cursor:
+        collection_exists = fetch_rows(cursor, *parameterized(generate_check_collection_query, collection_name))[0]['record_count'] > 0
+        existing_players = []
+        if collection_exists:
+            existing_players = [row['full_name'].strip() for row in fetch_rows(cursor, *parameterized(generate_check_specific_players_query, collection_name, player_list))]
+        print(f"Collection exists: {'yes' if collection_exists else 'no'}. Existing players: {len(existing_players)}.")
+
+        # The counter row stays locked until this transaction ends, so concurrent runs wait for each other's slugs
+        new_card_count = count_new_cards(player_groups, existing_players)
+        next_slug_number = fetch_rows(cursor, *parameterized(generate_allocate_slugs_query, collection_name, new_card_count))[0]['first_slug']
+        highest_slug_number = next_slug_number - 1
+        final_slug_number = next_slug_number + new_card_count
+
+        sql, parameters = parameterized(generate_check_and_create_competition_query, competition_name)
+        cursor.execute(competition_block(sql), parameters)
+
+        new_players = [row + (offset,) for offset, row in enumerate(iter_new_players(player_groups, existing_players))]
+        execute_values(cursor, create_players_query_from("%s"), new_players, page_size=BULK_ROWS)
+
+        card_images = [row + (offset,) for offset, row in enumerate(iter_card_images(player_groups, collection_name, existing_players, next_slug_number))]
+        card_players = list(dict.fromkeys(row[:2] for row in card_images))
+        execute_values(cursor, check_card_players_query("(VALUES %s) AS c (first_name, last_name)"), card_players, page_size=BULK_ROWS)
+        insert_card_images = insert_card_images_query_from("(VALUES %s) AS c (first_name, last_name, card_image_url, dashboard_slug, ord)")
+        execute_values(cursor, insert_card_images.replace("@competition_id", COMPETITION_ID), card_images, page_size=BULK_ROWS)
+        print(f"Inserted {new_card_count} card images with slugs {collection_name}/{next_slug_number} to {collection_name}/{final_slug_number - 1}.")
+
+        qr_status = fetch_rows(cursor, *parameterized(generate_qr_code_check_query, collection_name, player_list))
+        players_needing_qr = [row['full_name'].strip() for row in qr_status if row['qr_code_status'] == 'Missing']
+        if players_needing_qr:
+            invite_type = generate_invite_type(collection_name)
+            cursor.execute(*parameterized(generate_invitation_query, collection_name, invite_type, players_needing_qr))
+            cursor.execute(*parameterized(generate_qr_redirect_query, invite_type, players_needing_qr))
+            print(f"Created invitations and QR redirects for {len(players_needing_qr)} players (invite type: {invite_type}).")
+
+    output_file = os.path.join(output_folder, f"{collection_name}_qr_code_check.csv")
+    sql, parameters = parameterized(generate_view_query, collection_name, highest_slug_number, final_slug_number - 1)
+    database.export_csv(sql, output_file, parameters)
+    return output_file
+
 def main():
     print_welcome_message()
     collection_name = input("Enter the collection name (e.g., summer-select-24): ")
     competition_name = input("Enter the competition name: ")
     team_name = input("Enter the team name: ")
 
-    parsed_csv_path = input("Enter the path to the parsed card data CSV file: ")
+    parsed_csv_path = input("Enter the path to the parsed card data CSV file or the card catalog: ")
     try:
         parsed_csv_path = sanitize_path(parsed_csv_path)
     except FileNotFoundError as e:
@@ -303,12 +620,28 @@ def main():
         return
 
     try:
-        player_groups = group_filenames_by_player(parsed_csv_path)
+        player_groups = group_filenames_by_player(parsed_csv_path, collection_name)
     except (ValueError, KeyError) as e:
         print(f"Error processing CSV file: {e}")
         print("Please ensure your CSV file has the correct column names and try again.")
         return
 
+    run_directly = input("\nRun the queries directly against the database instead of writing them for pgAdmin? (y/n): ").lower() == 'y'
+    if run_directly:
+        database_url = input(f"Enter the database URL (press Enter to use ${DATABASE_URL_VARIABLE}): ").strip() or default_database_url()
+        if not database_url:
+            print(f"No database URL given and ${DATABASE_URL_VARIABLE} is not set. Exiting.")
+            return
+        try:
+            with AthletifiDatabase(database_url) as database:
+                output_file = run_direct(database, collection_name, competition_name, team_name, player_groups)
+        except ImportError:
+            print("Running queries directly requires psycopg2. Install it with: pip install -r requirements.txt")
+            return
+        print(f"\nAll changes were committed. The QR code check results have been exported to {output_file}")
+        print("Use this CSV with process_qr_code_csv.py to continue the process.")
+        return
+
     # Check if collection exists
     check_collection_query = generate_check_collection_query(collection_name)
     print("\nPlease run the following query in pgAdmin to check if the collection exists:")
@@ -316,15 +649,6 @@ def main():
     print("\nIf the count is greater than 0, that means there are records in this collection, and thus the collection already exists.")
     collection_exists = input("\nIs the count greater than 0? (y/n): ").lower() == 'y'
 
-    highest_slug_number = 0
-    if collection_exists:
-        get_highest_slug_query = generate_get_highest_slug_query(collection_name)
-        print("\nPlease run the following query in pgAdmin to get the highest existing slug number:")
-        print(get_highest_slug_query)
-        highest_slug_number = int(input("\nEnter the max_slug (if no results, enter 0): "))
-
-    next_slug_number = highest_slug_number + 1
-
     existing_players = []
     if collection_exists:
         # Check for existing players
@@ -362,37 +686,32 @@ def main():
         else:
             print("No existing players found. Proceeding with creating records for all players.")
 
+    # Reserve the dashboard slugs for the new cards on the server
+    new_card_count = count_new_cards(player_groups, existing_players)
+    next_slug_number = 1
+    if new_card_count:
+        allocate_slugs_query = generate_allocate_slugs_query(collection_name, new_card_count)
+        print(f"\nPlease run the following query in pgAdmin to reserve {new_card_count} dashboard slugs for the new cards:")
+        print(allocate_slugs_query)
+        print("Run it only once: every run reserves a new block of slugs.")
+        next_slug_number = int(input("\nEnter the first_slug returned by the query: "))
+    highest_slug_number = next_slug_number - 1
+
     # Generate update queries
-    check_and_create_competition_query = generate_check_and_create_competition_query(competition_name)
-    create_missing_records_queries = generate_create_missing_records_query(player_groups, existing_players)
-    insert_card_images_queries, final_slug_number = generate_insert_card_images_query(
-        player_groups, collection_name, team_name, existing_players, next_slug_number
-    )
+    bulk_mode = input("\nGenerate set-based bulk statements instead of one statement per card? Recommended for large collections (y/n): ").lower() == 'y'
+    chunk_input = input(f"Enter the number of players or cards per transaction (press Enter to use {CHUNK_ROWS}): ").strip()
+    chunk_rows = int(chunk_input) if chunk_input else CHUNK_ROWS
 
-    # Write update queries to a file
+    # Stream the update queries straight to a file, one transaction per chunk
     output_file = f"{collection_name}_update_player_info_queries.sql"
     with open(output_file, 'w') as f:
-        f.write("BEGIN;\n\n")
-        f.write("-- Check if competition exists and create if it doesn't\n")
-        f.write("DO $$\n")
-        f.write("DECLARE\n")
-        f.write("    comp_id UUID;\n")
-        f.write("BEGIN\n")
-        f.write(f"    {check_and_create_competition_query}\n")
-        f.write("    INTO comp_id;\n")
-        f.write("    PERFORM set_config('athletifi.competition_id', comp_id::text, false);\n")
-        f.write("END $$;\n\n")
-        f.write("-- Create missing player records\n")
-        for query in create_missing_records_queries:
-            f.write(query + "\n")
-        f.write("-- Insert or update player card images\n")
-        for query in insert_card_images_queries:
-            modified_query = query.replace("@competition_id", "(SELECT current_setting('athletifi.competition_id')::uuid)")
-            f.write(modified_query + "\n")
-        f.write("\nCOMMIT;")
+        final_slug_number = write_update_script(f, competition_name, player_groups, collection_name, team_name,
+                                                existing_players, next_slug_number, bulk_mode, chunk_rows)
 
     print(f"\nStep 1: SQL queries for creating/updating records have been written to {output_file}")
     print("Please review and execute this file in pgAdmin.")
+    print("The file is split into separate transactions. If one fails, fix the problem and re-run just that chunk;")
+    print("the chunks committed before it are kept. Progress is shown as notices in the pgAdmin Messages tab.")
 
     # Get the list of players being added
     players_to_add = list(player_groups.keys())
@@ -450,7 +769,7 @@ def main():
         print(f"Invite type used: {invite_type}")
 
     # Generate view query
-    view_query = generate_view_query(collection_name, highest_slug_number)
+    view_query = generate_view_query(collection_name, highest_slug_number, final_slug_number - 1)
     print("\nStep 5: After executing the above queries, run this query to check QR codes for newly added players and export the results as a CSV file:")
     print(view_query)
     print("\nThis query will return the card_image_url, qrcode_id, and dashboard_slug for each newly added card in the collection.")
@@ -476,6 +795,8 @@ def print_welcome_message():
     2. Prepare a CSV file with the following fields: 
     ✦ first_name, last_name, jersey_number, and webp_filename
     *Note: you can use the parse_filenames.py script to generate this automatically.*
+    You can also give the card catalog (scripts/python/.card_catalog.sqlite3) instead;
+    its cards that are not in the database yet are used.
     3. Know the collection name, competition name, and team name.
 
     ┌──────────────────────────────────────────┐
@@ -483,6 +804,8 @@ def print_welcome_message():
     └──────────────────────────────────────────┘
     This script generates SQL queries for you to run in pgAdmin. It does not
     directly modify the database. *Always review the generated SQL before execution.*
+    Optionally, it can instead run every step directly against the database in one
+    transaction and export the QR code check CSV for you.
 
     Let's get started with updating your AthletiFi player card database!
     """
@@ -1,6 +1,11 @@
-import re
 import csv
 import os
+import sys
+
+# The filename grammar is shared with the renamer in front-step5_back-step1
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+from card_filenames import parse_card_filename, webp_filename_for
+from card_catalog import CardCatalog, DEFAULT_CATALOG_PATH
 
 def sanitize_path(input_path):
     sanitized = input_path.strip('\'"').replace("\\ ", " ").strip()
@@ -10,84 +15,20 @@ def sanitize_path(input_path):
         raise FileNotFoundError(f"Sanitized path is not a valid file or directory: {sanitized}")
 
 def parse_filename(filename):
-    # Store original filename
-    original_filename = filename
-    
-    patterns = [
-        # New pattern
-        re.compile(r'([A-Za-z\' ]+)-([A-Za-z\' ]+)-(\d+)-(Bronze|Silver)-(.+?)-(\d+)\.pdf'),
-        # Old patterns
-        re.compile(r'(Bronze|Silver) v2 - (.+?)_(CMYK|RGB)?_?(.+?)-(\d+)-with-text-layer_.+?_(\d+)\.pdf'),
-        re.compile(r'(Bronze|Silver) v2 - (.+?)_(CMYK|RGB)_(.+?)-(\d+)-with-text-layer_.+?vector border with bleed_(\d+)\.pdf'),
-        re.compile(
-            r'(?P<edition>Bronze v[12]|Silver v[12]|Galaxy|Dragon Purple|Dragon Red|Universe Nebula|Space) - '
-            r'(?P<background_name>[A-Za-z ]+)_'
-            r'(?P<player_name>.+?)-'
-            r'(?P<pose_number>\d+)-'
-            r'(?P<pose_type>running|shooting|standing)-pose-'
-            r'print-with-text-layer_NEW (rectangle )?'
-            r'(?P<border_style>v[12] [A-Za-z]+ Border)_vector border [a-z]+_'
-            r'(?P<edition_serial_number>\d+).pdf'
-        ),
-        re.compile(r'(.+?)[-_](\d+)[-_](Bronze|Silver|Galaxy|Dragon Purple|Dragon Red|Universe Nebula|Space)[-_](.+?)[-_](\d+)\.pdf', re.IGNORECASE),
-        re.compile(r'(Bronze|Silver) v2 - ([A-Za-z ]+)_(.+?)-(\d+)-with-text-layer_(\d+)\.pdf')
-    ]
-    
-    for pattern in patterns:
-        match = pattern.match(filename)
-        if match:
-            if isinstance(match.groupdict(), dict) and match.groupdict():
-                # Handle named groups
-                data = match.groupdict()
-                full_name = data.get('player_name', '')
-                names = full_name.split('-', 1) if '-' in full_name else [full_name, '']
-                first_name = names[0]
-                last_name = names[1] if len(names) > 1 else ""
-            else:
-                # Handle unnamed groups for new pattern (first_name-last_name-number-edition-theme-serial)
-                groups = match.groups()
-                if len(groups) == 6 and groups[3] in ['Bronze', 'Silver']:  # New pattern
-                    first_name = groups[0]
-                    last_name = groups[1]
-                    jersey_number = groups[2]
-                    edition = groups[3]
-                    theme = groups[4]
-                    serial_number = groups[5]
-                elif len(groups) == 6:  # Most old patterns
-                    edition = groups[0]
-                    theme = groups[1]
-                    full_name = groups[3]
-                    names = full_name.split('-', 1) if '-' in full_name else [full_name, '']
-                    first_name = names[0]
-                    last_name = names[1] if len(names) > 1 else ""
-                    jersey_number = groups[4]
-                    serial_number = groups[5]
-                else:  # Other old patterns
-                    full_name = groups[2] if len(groups) > 2 else ''
-                    names = full_name.split('-', 1) if '-' in full_name else [full_name, '']
-                    first_name = names[0]
-                    last_name = names[1] if len(names) > 1 else ""
-                    jersey_number = groups[4] if len(groups) > 4 else ''
-                    edition = groups[0] if groups[0] in ['Bronze', 'Silver'] else ''
-                    theme = groups[1] if groups[1] not in ['Bronze', 'Silver'] else ''
-                    serial_number = groups[-1]
-
-            # Convert filename to webp and replace spaces with hyphens
-            webp_filename = original_filename.rsplit('.', 1)[0] + '.webp'
-            webp_filename = webp_filename.replace(' ', '-')
+    record = parse_card_filename(filename)
+    if record is None:
+        return None
 
-            return {
-                'first_name': first_name,
-                'last_name': last_name,
-                'jersey_number': jersey_number,
-                'edition': edition,
-                'theme': theme,
-                'serial_number': serial_number,
-                'original_filename': original_filename,
-                'webp_filename': webp_filename
-            }
-    
-    return None
+    return {
+        'first_name': record.first_name,
+        'last_name': record.last_name,
+        'jersey_number': record.jersey_number,
+        'edition': record.edition,
+        'theme': record.theme,
+        'serial_number': record.serial_number,
+        'original_filename': filename,
+        'webp_filename': webp_filename_for(filename)
+    }
 
 def main():
     print("""
@@ -111,6 +52,10 @@ def main():
     ✦ Serial Number
     ✦ Original Filename (PDF)
     ✦ WebP Filename (converted to .webp and with spaces replaced by hyphens)
+
+    The cards are also added to the shared card catalog under their collection,
+    which the later steps read from. Filenames already cataloged in the same
+    collection are not parsed again.
     
     Let's get started!
     """)
@@ -125,6 +70,8 @@ def main():
             print(f"Error: {e}")
             print("Please try again with a valid file path.")
 
+    collection_name = input("Enter the collection name these cards belong to (e.g., summer-select-24): ").strip()
+
     # Read filenames from the CSV file
     filenames = []
     with open(sanitized_csv_path, 'r') as csvfile:
@@ -133,28 +80,20 @@ def main():
         for row in reader:
             filenames.append(row[0])  # Assuming the filenames are in the first column
 
-    # Parse filenames and store results
-    parsed_data = []
-    for filename in filenames:
-        result = parse_filename(filename)
-        if result:
-            parsed_data.append(result)
-        else:
+    # Catalog the filenames; only names the collection has not cataloged yet are parsed
+    with CardCatalog(DEFAULT_CATALOG_PATH) as catalog:
+        unparsed = catalog.add_filenames(filenames, collection_name, stage='parse_filenames')
+        for filename in unparsed:
             print(f"Warning: Unable to parse filename: {filename}")
 
-    # Write parsed data to a CSV file for easy viewing and further processing
-    output_csv_path = 'parsed_card_data.csv'
-    fieldnames = ['first_name', 'last_name', 'jersey_number', 'edition', 'theme', 'serial_number', 'original_filename', 'webp_filename']
-    
-    with open(output_csv_path, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        for row in parsed_data:
-            writer.writerow(row)
+        # Write parsed data to a CSV file for easy viewing and further processing
+        output_csv_path = 'parsed_card_data.csv'
+        catalog.write_parsed_csv(output_csv_path, collection_name, filenames)
+        parsed_count = len(set(filenames)) - len(unparsed)
 
-    print(f"\nParsing complete! {len(parsed_data)} filenames processed.")
+    print(f"\nParsing complete! {parsed_count} filenames processed.")
     print(f"Results have been written to: {output_csv_path}")
+    print(f"Cards have been added to the catalog for {collection_name}: {DEFAULT_CATALOG_PATH}")
     print("\nThank you for using the AthletiFi Card Filename Parser!")
 
 if __name__ == "__main__":
@@ -1,7 +1,13 @@
 import csv
 import os
+import sys
+from collections import defaultdict
 from datetime import datetime
 
+# The card catalog is shared with parse_filenames.py and generate_athletifi_db_queries.py in back-step3
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+from card_catalog import CardCatalog, DEFAULT_CATALOG_PATH, is_catalog_path
+
 def sanitize_path(input_path):
     sanitized = input_path.strip('\'"').replace("\\ ", " ").strip()
     if os.path.exists(sanitized):
@@ -10,6 +16,8 @@ def sanitize_path(input_path):
         raise FileNotFoundError(f"Not a valid file path: {sanitized}. Please try again.")
 
 def load_parsed_card_data(parsed_csv_path):
+    if is_catalog_path(parsed_csv_path):
+        return CatalogCardData(parsed_csv_path)
     card_data = {}
     with open(parsed_csv_path, 'r') as csvfile:
         reader = csv.DictReader(csvfile)
@@ -17,6 +25,41 @@ def load_parsed_card_data(parsed_csv_path):
             card_data[row['webp_filename']] = row['original_filename']
     return card_data
 
+class CatalogCardData:
+    """Read-only webp-to-pdf filename mapping backed by the card catalog, looked up one card at a time per collection."""
+    def __init__(self, path):
+        self.catalog = CardCatalog(path)
+
+    def original_filename(self, collection, webp_filename):
+        return self.catalog.pdf_filename_for_webp(collection, os.path.basename(webp_filename))
+
+def find_original_filename(parsed_card_data, collection, webp_filename):
+    if isinstance(parsed_card_data, CatalogCardData):
+        return parsed_card_data.original_filename(collection, webp_filename)
+    return parsed_card_data.get(webp_filename)
+
+def record_database_fields(catalog_path, database_rows):
+    """
+    Store the QR code, image URL and slug from the QR code check export in the card catalog.
+
+    Cards are recorded whether their filenames came from the catalog or from parsed_card_data.csv,
+    so the catalog stops listing them as still to be added.
+
+    Args:
+    catalog_path (str): Path of the card catalog.
+    database_rows (list): Dicts with 'collection', 'webp_filename' and the database fields.
+
+    Returns:
+    int: Number of cards updated.
+    """
+    rows_by_collection = defaultdict(list)
+    for row in database_rows:
+        if row['collection']:
+            rows_by_collection[row['collection']].append(row)
+    with CardCatalog(catalog_path) as catalog:
+        return sum(catalog.record_database_fields(collection, rows, stage='process_qr_code_csv')
+                   for collection, rows in rows_by_collection.items())
+
 def process_csv(input_file, output_folder, s3_prefix, parsed_card_data):
     # Generate output filename
     input_filename = os.path.basename(input_file)
@@ -24,6 +67,7 @@ def process_csv(input_file, output_folder, s3_prefix, parsed_card_data):
     output_filename = f"processed_{os.path.splitext(input_filename)[0]}_{timestamp}.csv"
     output_file = os.path.join(output_folder, output_filename)
 
+    database_rows = []
     with open(input_file, 'r') as infile, open(output_file, 'w', newline='') as outfile:
         reader = csv.DictReader(infile)
         fieldnames = ['card_filename', 'qr_code_url']
@@ -33,12 +77,21 @@ def process_csv(input_file, output_folder, s3_prefix, parsed_card_data):
         for row in reader:
             # Process card_image_url
             webp_filename = row['card_image_url'].replace(s3_prefix, '')
-            if webp_filename in parsed_card_data:
-                card_filename = parsed_card_data[webp_filename]
-            else:
+            dashboard_slug = row.get('dashboard_slug') or None
+            collection = dashboard_slug.rsplit('/', 1)[0] if dashboard_slug else None
+            card_filename = find_original_filename(parsed_card_data, collection, webp_filename)
+            if card_filename is None:
                 print(f"Warning: No matching original filename found for {webp_filename}")
                 card_filename = webp_filename.replace('.webp', '.pdf')
 
+            database_rows.append({
+                'webp_filename': os.path.basename(webp_filename),
+                'collection': collection,
+                'card_image_url': row['card_image_url'],
+                'dashboard_slug': dashboard_slug,
+                'qrcode_id': row['qrcode_id'] or None,
+            })
+
             # Process qrcode_id
             qr_code_url = f"https://athleti.fi/qr-code/{row['qrcode_id']}"
 
@@ -47,7 +100,7 @@ def process_csv(input_file, output_folder, s3_prefix, parsed_card_data):
                 'qr_code_url': qr_code_url
             })
 
-    return output_file
+    return output_file, database_rows
 
 def print_welcome_message():
     welcome_text = """
@@ -59,7 +112,7 @@ def print_welcome_message():
     preparing it for use with the QR code generator. It performs the following tasks:
 
     1. Removes the S3 URL prefix from card image URLs
-    2. Restores original filenames using data from parsed_card_data.csv
+    2. Restores original filenames using data from parsed_card_data.csv or the card catalog
     3. Prepends the QR code base URL to qrcode_id values
     4. Renames columns appropriately
     5. Removes the dashboard_slug column
@@ -67,7 +120,8 @@ def print_welcome_message():
     ┌──────────────────────────────────────────┐
     │           Before You Begin:              │
     └──────────────────────────────────────────┘
-    1. Have the parsed_card_data.csv file generated by parse_filenames.py.
+    1. Have the parsed_card_data.csv file generated by parse_filenames.py, or the card
+       catalog it writes to (scripts/python/.card_catalog.sqlite3).
     2. Ensure you have the CSV file exported from the QR code check query from generate_athletifi_db_queries.py
     3. Know the S3 URL prefix for your card images.
     4. Have a destination folder in mind for the processed CSV file.
@@ -79,7 +133,7 @@ def print_welcome_message():
 def main():
     print_welcome_message()
 
-    parsed_csv_path = input("Enter the path to the parsed_card_data.csv file: ")
+    parsed_csv_path = input("Enter the path to the parsed_card_data.csv file or the card catalog: ")
     try:
         parsed_csv_path = sanitize_path(parsed_csv_path)
     except FileNotFoundError as e:
@@ -107,7 +161,12 @@ def main():
         print(f"Using default S3 URL prefix: {s3_prefix}")
 
     parsed_card_data = load_parsed_card_data(parsed_csv_path)
-    output_file = process_csv(input_file, output_folder, s3_prefix, parsed_card_data)
+    output_file, database_rows = process_csv(input_file, output_folder, s3_prefix, parsed_card_data)
+
+    catalog_path = parsed_csv_path if is_catalog_path(parsed_csv_path) else DEFAULT_CATALOG_PATH
+    if os.path.exists(catalog_path):
+        recorded = record_database_fields(catalog_path, database_rows)
+        print(f"\nRecorded QR codes for {recorded} cards in the card catalog: {catalog_path}")
 
     print(f"\nProcessed CSV has been saved to: {output_file}")
     print("\nThe CSV is now ready for use with the QR code generator.")
@@ -1,6 +1,14 @@
 import os
 import io
-from PIL import Image
+import csv
+import math
+import json
+import time
+import shutil
+import struct
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image, ImageChops, ImageStat
 import fitz  # PyMuPDF
 from tqdm import tqdm
 
@@ -25,7 +33,10 @@ def print_welcome_message():
     └──────────────────────────────────────────┘
     ✦ This script preserves transparency in the PNG files.
     ✦ The output PDFs will have the same dimensions as the provided blank PDF template.
-    ✦ The script applies compression to optimize the output PDF files.
+    ✦ PNG data is embedded without re-encoding where possible; maximum
+      re-compression is available as an option.
+    ✦ Converted PDFs are cached by content, so unchanged backgrounds are
+      copied from the cache instead of being converted again.
     ✦ Original PNG files are not modified; new PDF files are created.
 
     Let's begin converting your PNG backgrounds to PDF format!
@@ -68,7 +79,335 @@ def sanitize_path(input_path):
     else:
         raise FileNotFoundError(f"Sanitized path is not a valid file or directory: {sanitized}")
 
-def png_to_pdf(input_dir, output_dir, blank_pdf_path):
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def read_png_stream(input_path):
+    """
+    Read a PNG's compressed image data if it can be embedded in a PDF as-is.
+    
+    PNG image data is a zlib stream with per-row filters, which PDF can decode
+    directly with FlateDecode and a PNG predictor. This works for non-interlaced
+    8-bit greyscale or RGB PNGs without transparency or an embedded colour profile;
+    anything else returns None and has to be decoded.
+    
+    Returns:
+    dict: Width, height, colour component count and concatenated IDAT data, or None.
+    """
+    with open(input_path, 'rb') as png_file:
+        data = png_file.read()
+    if not data.startswith(PNG_SIGNATURE):
+        return None
+
+    header, idat = None, []
+    position = len(PNG_SIGNATURE)
+    while position + 8 <= len(data):
+        length, chunk_type = struct.unpack('>I4s', data[position:position + 8])
+        body = data[position + 8:position + 8 + length]
+        if chunk_type == b'IHDR':
+            header = struct.unpack('>IIBBBBB', body)
+        elif chunk_type == b'IDAT':
+            idat.append(body)
+        elif chunk_type in (b'tRNS', b'iCCP'):
+            return None
+        elif chunk_type == b'IEND':
+            break
+        position += length + 12
+
+    if header is None or not idat:
+        return None
+    width, height, bit_depth, color_type, _, _, interlace = header
+    if bit_depth != 8 or interlace != 0 or color_type not in (0, 2):
+        return None
+    return {'width': width, 'height': height, 'colors': 1 if color_type == 0 else 3, 'data': b''.join(idat)}
+
+def insert_png_stream(page, png_stream):
+    """Embed PNG image data from read_png_stream on a page without decoding it."""
+    pdf = page.parent
+    xref = pdf.get_new_xref()
+    pdf.update_object(xref, "<<>>")
+    pdf.update_stream(xref, png_stream['data'], compress=False)
+    decode_parms = f"<</Predictor 15/Colors {png_stream['colors']}/BitsPerComponent 8/Columns {png_stream['width']}>>"
+    for key, value in [
+        ("Type", "/XObject"),
+        ("Subtype", "/Image"),
+        ("Width", str(png_stream['width'])),
+        ("Height", str(png_stream['height'])),
+        ("ColorSpace", "/DeviceGray" if png_stream['colors'] == 1 else "/DeviceRGB"),
+        ("BitsPerComponent", "8"),
+        ("Filter", "/FlateDecode"),
+        ("DecodeParms", decode_parms),
+    ]:
+        pdf.xref_set_key(xref, key, value)
+    page.insert_image(page.rect, xref=xref)
+
+TARGET_DPI_PRESETS = {'print': 300, 'digital': 150}
+DEFAULT_SETTINGS = {'optimize': False, 'target_dpi': None, 'encoding': 'png', 'quality': 90}
+REPORT_FILENAME = 'conversion_report.csv'
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.png_to_pdf_cache')
+DEFAULT_CACHE_SIZE_MB = 2048
+CACHE_VERSION = 2
+
+def effective_dpi(image_width, image_height, width, height):
+    """Return the DPI an image ends up at when fitted onto a page of width x height points."""
+    points_per_pixel = min(width / image_width, height / image_height)
+    return 72 / points_per_pixel
+
+def psnr(reference, candidate):
+    """Return the peak signal-to-noise ratio in dB between two same-sized images (inf if identical)."""
+    stat = ImageStat.Stat(ImageChops.difference(reference, candidate))
+    mse = sum(rms ** 2 for rms in stat.rms) / len(stat.rms)
+    return float('inf') if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+def encode_image(img, settings):
+    """
+    Encode an image for embedding, splitting off any alpha channel as a separate soft mask.
+    
+    Returns:
+    tuple: (encoded image bytes, soft mask PNG bytes or None, decoded result for quality measurement)
+    """
+    has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+    encoding = settings['encoding']
+    if encoding == 'png':
+        img_bytes = io.BytesIO()
+        if settings['optimize']:
+            img.save(img_bytes, format='PNG', optimize=True, compress_level=9)
+        else:
+            img.save(img_bytes, format='PNG')
+        return img_bytes.getvalue(), None, img
+
+    # JPEG and JPEG2000 have no alpha, so transparency travels as a lossless soft mask
+    img = img.convert('RGBA') if has_alpha else img.convert('RGB')
+    color = img.convert('RGB')
+    color_bytes = io.BytesIO()
+    if encoding == 'jpeg':
+        color.save(color_bytes, format='JPEG', quality=settings['quality'], optimize=True)
+    elif encoding == 'jpeg2000':
+        # Map quality 1-100 onto a target PSNR of roughly 20-50 dB
+        color.save(color_bytes, format='JPEG2000', quality_mode='dB', quality_layers=[20 + settings['quality'] * 0.3])
+    else:
+        raise ValueError(f"Unknown encoding: {encoding}")
+    decoded = Image.open(io.BytesIO(color_bytes.getvalue())).convert('RGB')
+
+    mask_bytes = None
+    if has_alpha:
+        alpha = img.getchannel('A')
+        mask_buffer = io.BytesIO()
+        alpha.save(mask_buffer, format='PNG')
+        mask_bytes = mask_buffer.getvalue()
+        decoded = decoded.convert('RGBA')
+        decoded.putalpha(alpha)
+    return color_bytes.getvalue(), mask_bytes, decoded
+
+def convert_png(input_path, output_path, width, height, settings=None):
+    """
+    Convert a single PNG into a one-page PDF of the given size.
+    
+    By default the PNG's own compressed data is embedded when possible, and
+    otherwise PyMuPDF decodes the PNG itself (keeping transparency). With a
+    target DPI, images above that resolution at the page size are downsampled
+    first. The image can also be re-encoded as JPEG or JPEG2000 with the alpha
+    channel kept as a soft mask, or as PNG at maximum compression (`optimize`).
+    
+    Args:
+    input_path (str): Path to the PNG.
+    output_path (str): Path to save the PDF.
+    width (float): Page width in points.
+    height (float): Page height in points.
+    settings (dict, optional): Encode settings; see DEFAULT_SETTINGS.
+    
+    Returns:
+    dict: Report row with resolutions, encoding, byte sizes and PSNR.
+    """
+    settings = dict(DEFAULT_SETTINGS, **(settings or {}))
+    pdf = fitz.open()
+    page = pdf.new_page(width=width, height=height)
+
+    png_stream = read_png_stream(input_path)
+    with Image.open(input_path) as img:
+        source_size = img.size
+    source_dpi = effective_dpi(source_size[0], source_size[1], width, height)
+    target_dpi = settings['target_dpi']
+    needs_resample = target_dpi is not None and source_dpi > target_dpi * 1.01
+    output_size, quality = source_size, 'lossless'
+
+    if png_stream is not None and not needs_resample and not settings['optimize'] and settings['encoding'] == 'png':
+        insert_png_stream(page, png_stream)
+    elif not needs_resample and not settings['optimize'] and settings['encoding'] == 'png':
+        page.insert_image(page.rect, filename=input_path)
+    else:
+        with Image.open(input_path) as img:
+            img.load()
+            source = img
+            if needs_resample:
+                scale = target_dpi / source_dpi
+                output_size = (max(1, round(source_size[0] * scale)), max(1, round(source_size[1] * scale)))
+                img = img.resize(output_size, Image.LANCZOS)
+            image_bytes, mask_bytes, decoded = encode_image(img, settings)
+            page.insert_image(page.rect, stream=image_bytes, mask=mask_bytes)
+
+            # Compare what ends up in the PDF with the source at full resolution
+            if needs_resample or settings['encoding'] != 'png':
+                mode = 'RGBA' if decoded.mode == 'RGBA' else 'RGB'
+                quality = round(psnr(source.convert(mode), decoded.convert(mode).resize(source_size, Image.LANCZOS)), 2)
+
+    # Save the PDF with compression
+    pdf.save(output_path, garbage=4, deflate=True, clean=True)
+    pdf.close()
+
+    input_bytes, output_bytes = os.path.getsize(input_path), os.path.getsize(output_path)
+    return {
+        'filename': os.path.basename(input_path),
+        'source_pixels': f"{source_size[0]}x{source_size[1]}",
+        'source_dpi': round(source_dpi),
+        'output_pixels': f"{output_size[0]}x{output_size[1]}",
+        'output_dpi': round(effective_dpi(output_size[0], output_size[1], width, height)),
+        'encoding': settings['encoding'],
+        'input_bytes': input_bytes,
+        'output_bytes': output_bytes,
+        'bytes_saved': input_bytes - output_bytes,
+        'psnr_db': quality,
+    }
+
+def write_report(report_rows, output_dir):
+    """Write the per-file conversion report and print a summary of the bytes saved."""
+    report_rows = sorted(report_rows, key=lambda row: row['filename'])
+    report_path = os.path.join(output_dir, REPORT_FILENAME)
+    with open(report_path, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=list(report_rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(report_rows)
+
+    total_input = sum(row['input_bytes'] for row in report_rows)
+    total_saved = sum(row['bytes_saved'] for row in report_rows)
+    print(f"Bytes saved compared to the source PNGs: {total_saved:,} of {total_input:,} "
+          f"({total_saved / total_input * 100 if total_input else 0:.1f}%).")
+    print(f"Per-file report (resolution, bytes saved, PSNR) written to: {report_path}")
+
+def link_or_copy(source_path, destination_path):
+    """Hardlink source to destination, falling back to a copy across filesystems."""
+    if os.path.exists(destination_path):
+        os.remove(destination_path)
+    try:
+        os.link(source_path, destination_path)
+    except OSError:
+        shutil.copyfile(source_path, destination_path)
+
+class ConversionCache:
+    """
+    Content-addressed cache of converted PDFs.
+    
+    Entries are keyed by the PNG's content hash, the page size and the encode
+    settings, so a background that has not changed is never decoded again. Each
+    entry is a PDF plus a JSON sidecar holding its report row and when it was
+    last used. The cached PDF shares its inode with the output it was linked to,
+    so its mtime is never touched; recency lives in the sidecar only. Entries
+    are evicted least-recently-used first as soon as the cache grows past its
+    size limit.
+    """
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self.entries = self._load_entries()
+        self.total_bytes = sum(size for _, size in self.entries.values())
+
+    def _load_entries(self):
+        # Map each key to (last used, PDF size), read from the sidecars once per run
+        entries = {}
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith('.pdf'):
+                continue
+            key = entry.name[:-len('.pdf')]
+            try:
+                with open(self._paths(key)[1]) as f:
+                    last_used = json.load(f).get('last_used', 0)
+            except (OSError, ValueError, AttributeError):
+                last_used = 0
+            entries[key] = (last_used, entry.stat().st_size)
+        return entries
+
+    def key(self, input_path, width, height, settings):
+        """Return the cache key for converting a PNG with the given page size and settings."""
+        sha = hashlib.sha256()
+        with open(input_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        sha.update(json.dumps([CACHE_VERSION, round(width, 3), round(height, 3), settings], sort_keys=True).encode())
+        return sha.hexdigest()
+
+    def _paths(self, key):
+        return os.path.join(self.cache_dir, key + '.pdf'), os.path.join(self.cache_dir, key + '.json')
+
+    def _write_sidecar(self, key, row, last_used):
+        row_path = self._paths(key)[1]
+        with open(row_path + '.part', 'w') as f:
+            json.dump({'row': row, 'last_used': last_used}, f)
+        os.replace(row_path + '.part', row_path)
+
+    def fetch(self, key, output_path):
+        """
+        Place the cached PDF for key at output_path.
+        
+        Returns:
+        dict or None: The cached report row, or None on a miss.
+        """
+        pdf_path, row_path = self._paths(key)
+        try:
+            with open(row_path) as f:
+                row = json.load(f)['row']
+            link_or_copy(pdf_path, output_path)
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+        now = time.time()
+        self._write_sidecar(key, row, now)
+        self.entries[key] = (now, self.entries.get(key, (0, os.path.getsize(pdf_path)))[1])
+        self.hits += 1
+        return row
+
+    def store(self, key, output_path, row):
+        """Add a freshly converted PDF and its report row to the cache, evicting old entries if it is full."""
+        pdf_path, _ = self._paths(key)
+        temp_path = pdf_path + '.part'
+        link_or_copy(output_path, temp_path)
+        os.replace(temp_path, pdf_path)
+        now = time.time()
+        self._write_sidecar(key, row, now)
+        _, old_size = self.entries.get(key, (0, 0))
+        size = os.path.getsize(pdf_path)
+        self.entries[key] = (now, size)
+        self.total_bytes += size - old_size
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """Remove least recently used entries until the cache fits its size limit; `keep` is never removed."""
+        if self.total_bytes <= self.max_bytes:
+            return self.total_bytes
+        for key, (_, size) in sorted(self.entries.items(), key=lambda item: item[1][0]):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            # Removing the cache's link leaves any output linked to the same inode intact
+            for stale_path in self._paths(key):
+                if os.path.exists(stale_path):
+                    os.remove(stale_path)
+            del self.entries[key]
+            self.total_bytes -= size
+            self.evicted += 1
+        return self.total_bytes
+
+    def print_stats(self):
+        total = self.evict()
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups * 100 if lookups else 0
+        print(f"Conversion cache: {self.hits} hits, {self.misses} misses ({hit_rate:.1f}% hit rate), "
+              f"{self.evicted} entries evicted, {total / (1024 * 1024):.1f} MB in {self.cache_dir}")
+
+def png_to_pdf(input_dir, output_dir, blank_pdf_path, settings=None, workers=1, cache=None):
     # Ensure output directory exists
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
@@ -79,31 +418,50 @@ def png_to_pdf(input_dir, output_dir, blank_pdf_path):
 
     # Get list of PNG files
     png_files = [f for f in os.listdir(input_dir) if f.lower().endswith('.png')]
+    jobs = [(os.path.join(input_dir, filename), os.path.join(output_dir, os.path.splitext(filename)[0] + '.pdf'))
+            for filename in png_files]
+
+    # Reuse cached conversions; only the misses are decoded and encoded
+    report_rows = []
+    settings = dict(DEFAULT_SETTINGS, **(settings or {}))
+    cache_keys = {}
+    if cache is not None:
+        misses = []
+        for input_path, output_path in tqdm(jobs, desc="Checking conversion cache"):
+            key = cache.key(input_path, width, height, settings)
+            row = cache.fetch(key, output_path)
+            if row is None:
+                cache_keys[output_path] = key
+                misses.append((input_path, output_path))
+            else:
+                row['filename'] = os.path.basename(input_path)
+                report_rows.append(row)
+        jobs = misses
 
     # Process each PNG in the input directory
-    for filename in tqdm(png_files, desc="Converting PNGs to PDFs"):
-        input_path = os.path.join(input_dir, filename)
-        output_path = os.path.join(output_dir, os.path.splitext(filename)[0] + '.pdf')
-
-        # Open the PNG
-        with Image.open(input_path) as img:
-            # Create a new PDF
-            pdf = fitz.open()
-            page = pdf.new_page(width=width, height=height)
-
-            # Convert PIL Image to PNG bytes (preserving transparency)
-            img_bytes = io.BytesIO()
-            img.save(img_bytes, format='PNG', optimize=True, compress_level=9)
-            img_bytes.seek(0)
-
-            # Insert the image into the PDF
-            page.insert_image(page.rect, stream=img_bytes.getvalue())
-
-            # Save the PDF with compression
-            pdf.save(output_path, garbage=4, deflate=True, clean=True)
-            pdf.close()
+    for _, output_path in jobs:
+        # Never write through a hardlink that is shared with the cache
+        if os.path.exists(output_path):
+            os.remove(output_path)
+    if workers <= 1:
+        for input_path, output_path in tqdm(jobs, desc="Converting PNGs to PDFs"):
+            report_rows.append(convert_png(input_path, output_path, width, height, settings))
+            if cache is not None:
+                cache.store(cache_keys[output_path], output_path, report_rows[-1])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(convert_png, input_path, output_path, width, height, settings): output_path
+                       for input_path, output_path in jobs}
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Converting PNGs to PDFs"):
+                report_rows.append(future.result())
+                if cache is not None:
+                    cache.store(cache_keys[futures[future]], futures[future], report_rows[-1])
 
     print(f"Conversion complete. {len(png_files)} files processed.")
+    if report_rows:
+        write_report(report_rows, output_dir)
+    if cache is not None:
+        cache.print_stats()
 
 def main():
     print_welcome_message()
@@ -112,9 +470,26 @@ def main():
     input_dir = sanitize_path(input("Enter the path to the directory containing PNG backgrounds: "))
     output_dir = sanitize_path(input("Enter the path to the output directory for PDFs: "))
     blank_pdf_path = sanitize_path(input("Enter the path to the blank PDF file: "))
+    settings = dict(DEFAULT_SETTINGS)
+    dpi_input = input("Enter a target resolution: 'print' (300 DPI), 'digital' (150 DPI), a DPI number, or press Enter to keep full resolution: ").strip().lower()
+    if dpi_input:
+        settings['target_dpi'] = TARGET_DPI_PRESETS.get(dpi_input) or int(dpi_input)
+    encoding_input = input("Enter the image encoding: 'png' (lossless, default), 'jpeg' or 'jpeg2000': ").strip().lower()
+    settings['encoding'] = encoding_input or 'png'
+    if settings['encoding'] == 'png':
+        settings['optimize'] = input("Re-encode PNGs at maximum compression? This is much slower but can give smaller files (y/n, default n): ").lower() == 'y'
+    else:
+        quality_input = input("Enter the quality from 1 to 100 (press Enter for 90): ").strip()
+        settings['quality'] = int(quality_input) if quality_input else 90
+    default_workers = os.cpu_count() or 1
+    workers_input = input(f"Enter the number of worker processes (press Enter to use all {default_workers} cores): ").strip()
+    workers = int(workers_input) if workers_input else default_workers
+    cache_input = input(f"Enter the conversion cache size in MB (press Enter for {DEFAULT_CACHE_SIZE_MB}, 0 to disable the cache): ").strip()
+    cache_size_mb = int(cache_input) if cache_input else DEFAULT_CACHE_SIZE_MB
+    cache = ConversionCache(DEFAULT_CACHE_DIR, cache_size_mb * 1024 * 1024) if cache_size_mb > 0 else None
 
     # Run the conversion
-    png_to_pdf(input_dir, output_dir, blank_pdf_path)
+    png_to_pdf(input_dir, output_dir, blank_pdf_path, settings, workers, cache)
 
     print_concluding_message()
 
@@ -123,64 +498,64 @@ if __name__ == "__main__":
 
 # OLD UNSTYLIZED VERSION BELOW (THIS VERSION SHOULD WORK IF THE ABOVE DOES NOT)
 
-import os
-import io
-from PIL import Image
-import fitz  # PyMuPDF
-from tqdm import tqdm
+# import os
+# import io
+# from PIL import Image
+# import fitz  # PyMuPDF
+# from tqdm import tqdm
 
-def sanitize_path(input_path):
-    """Sanitize the file path by handling both paths with escaped spaces and quoted paths."""
-    sanitized = input_path.strip('\'"').replace("\\ ", " ").strip()
-    if os.path.exists(sanitized):
-        return sanitized
-    else:
-        raise FileNotFoundError(f"Sanitized path is not a valid file or directory: {sanitized}")
+# def sanitize_path(input_path):
+#     """Sanitize the file path by handling both paths with escaped spaces and quoted paths."""
+#     sanitized = input_path.strip('\'"').replace("\\ ", " ").strip()
+#     if os.path.exists(sanitized):
+#         return sanitized
+#     else:
+#         raise FileNotFoundError(f"Sanitized path is not a valid file or directory: {sanitized}")
 
-def png_to_pdf(input_dir, output_dir, blank_pdf_path):
-    # Ensure output directory exists
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+# def png_to_pdf(input_dir, output_dir, blank_pdf_path):
+#     # Ensure output directory exists
+#     if not os.path.exists(output_dir):
+#         os.makedirs(output_dir)
 
-    # Open the blank PDF to get dimensions
-    with fitz.open(blank_pdf_path) as blank_pdf:
-        width, height = blank_pdf[0].rect.width, blank_pdf[0].rect.height
+#     # Open the blank PDF to get dimensions
+#     with fitz.open(blank_pdf_path) as blank_pdf:
+#         width, height = blank_pdf[0].rect.width, blank_pdf[0].rect.height
 
-    # Get list of PNG files
-    png_files = [f for f in os.listdir(input_dir) if f.lower().endswith('.png')]
+#     # Get list of PNG files
+#     png_files = [f for f in os.listdir(input_dir) if f.lower().endswith('.png')]
 
-    # Process each PNG in the input directory
-    for filename in tqdm(png_files, desc="Converting PNGs to PDFs"):
-        input_path = os.path.join(input_dir, filename)
-        output_path = os.path.join(output_dir, os.path.splitext(filename)[0] + '.pdf')
+#     # Process each PNG in the input directory
+#     for filename in tqdm(png_files, desc="Converting PNGs to PDFs"):
+#         input_path = os.path.join(input_dir, filename)
+#         output_path = os.path.join(output_dir, os.path.splitext(filename)[0] + '.pdf')
 
-        # Open the PNG
-        with Image.open(input_path) as img:
-            # Create a new PDF
-            pdf = fitz.open()
-            page = pdf.new_page(width=width, height=height)
+#         # Open the PNG
+#         with Image.open(input_path) as img:
+#             # Create a new PDF
+#             pdf = fitz.open()
+#             page = pdf.new_page(width=width, height=height)
 
-            # Convert PIL Image to PNG bytes (preserving transparency)
-            img_bytes = io.BytesIO()
-            img.save(img_bytes, format='PNG', optimize=True, compress_level=9)
-            img_bytes.seek(0)
+#             # Convert PIL Image to PNG bytes (preserving transparency)
+#             img_bytes = io.BytesIO()
+#             img.save(img_bytes, format='PNG', optimize=True, compress_level=9)
+#             img_bytes.seek(0)
 
-            # Insert the image into the PDF
-            page.insert_image(page.rect, stream=img_bytes.getvalue())
+#             # Insert the image into the PDF
+#             page.insert_image(page.rect, stream=img_bytes.getvalue())
 
-            # Save the PDF with compression
-            pdf.save(output_path, garbage=4, deflate=True, clean=True)
-            pdf.close()
+#             # Save the PDF with compression
+#             pdf.save(output_path, garbage=4, deflate=True, clean=True)
+#             pdf.close()
 
-    print(f"Conversion complete. {len(png_files)} files processed.")
+#     print(f"Conversion complete. {len(png_files)} files processed.")
 
-# Prompt for paths
-input_dir = sanitize_path(input("Enter the path to the directory containing PNG backgrounds: "))
-output_dir = sanitize_path(input("Enter the path to the output directory for PDFs: "))
-blank_pdf_path = sanitize_path(input("Enter the path to the blank PDF file: "))
+# # Prompt for paths
+# input_dir = sanitize_path(input("Enter the path to the directory containing PNG backgrounds: "))
+# output_dir = sanitize_path(input("Enter the path to the output directory for PDFs: "))
+# blank_pdf_path = sanitize_path(input("Enter the path to the blank PDF file: "))
 
-# Run the conversion
-png_to_pdf(input_dir, output_dir, blank_pdf_path)
+# # Run the conversion
+# png_to_pdf(input_dir, output_dir, blank_pdf_path)
 
 # OLD UNSTYLIZED VERSION BELOW (THIS VERSION SHOULD WORK IF THE ABOVE DOES NOT)
 
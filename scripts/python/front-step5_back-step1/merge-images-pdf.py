@@ -1,8 +1,19 @@
-from PIL import Image
+from PIL import Image, ImageDraw, ImageFont
 import os
 import itertools
 import fitz  # PyMuPDF
 import io
+import re
+import fnmatch
+import textwrap
+import queue
+import threading
+import time
+import csv
+import json
+import hashlib
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, wait, as_completed, FIRST_COMPLETED
 from tqdm import tqdm
 
 def print_welcome_message():
@@ -12,7 +23,8 @@ def print_welcome_message():
     ╚════════════════════════════════════════════════════════════════════╝
 
     This script combines background and player components for AthletiFi cards.
-    It can work with 2 or 3 layers of PDFs or images, allowing you to:
+    It can stack any number of layers of PDFs or images (e.g., background,
+    player + text and border) in a single pass, allowing you to:
 
     1. Merge layers in a 1-to-1 fashion
     2. Generate all possible combinations of layers
@@ -64,7 +76,7 @@ def load_variations(path, replicate_to_match=None):
         filenames = [os.path.basename(path)] * (replicate_to_match or 1)
     elif os.path.isdir(path):
         print("Path is a directory. Loading images and PDFs from directory...")
-        valid_files = [file for file in os.listdir(path) if file.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.pdf'))]
+        valid_files = [file for file in os.listdir(path) if file.lower().endswith(RASTER_EXTENSIONS + ('.pdf',))]
         print(f"Found {len(valid_files)} valid files.")
 
         for file in valid_files:
@@ -76,100 +88,1104 @@ def load_variations(path, replicate_to_match=None):
 
     return items, filenames
 
-def generate_combinations(layers, filenames, output_dir):
+LAYER_INDEX_FILENAME = ".layer_index.json"
+LAYER_INDEX_VERSION = 2
+RASTER_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+SAVE_OPTIONS = {'garbage': 4, 'deflate': True}
+
+def hash_file(path):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def open_layer_document(path):
+    """
+    Open a layer file as a PDF document.
+    
+    Raster files are decoded once and embedded as the only image of an in-memory
+    one-page PDF. Outputs then copy that embedded image stream instead of decoding
+    the raster file again.
+    """
+    if path.lower().endswith(RASTER_EXTENSIONS):
+        with fitz.open(path) as image_document:
+            return fitz.open("pdf", image_document.convert_to_pdf())
+    return fitz.open(path)
+
+def inspect_layer(path):
+    """
+    Read the metadata the renderer needs from a single layer file.
+    
+    Args:
+    path (str): Path to the layer file.
+    
+    Returns:
+    dict: Page size, page count, emptiness, content hash and colour spaces of the first page,
+    plus the time taken to decode a raster file.
+    """
+    started = time.perf_counter()
+    with open_layer_document(path) as document:
+        decode_seconds = time.perf_counter() - started
+        metadata = {
+            'version': LAYER_INDEX_VERSION,
+            'raster': path.lower().endswith(RASTER_EXTENSIONS),
+            'decode_seconds': decode_seconds,
+            'page_count': document.page_count,
+            'width': None,
+            'height': None,
+            'has_content': False,
+            'colorspaces': [],
+        }
+        if document.page_count > 0:
+            page = document[0]
+            images = page.get_images(full=True)
+            metadata['width'], metadata['height'] = page.rect.width, page.rect.height
+            metadata['has_content'] = bool(page.get_text() or page.get_drawings() or images)
+            metadata['colorspaces'] = sorted({image[5] for image in images if image[5]})
+    metadata['sha256'] = hash_file(path)
+    return metadata
+
+VIRTUAL_BLANK_PREFIX = "blank://"
+
+def virtual_blank_path(width, height, name):
+    """Return the pseudo-path that stands in for a blank layer of the given size that is never written to disk."""
+    # Rounded like create_blank_pdf_copies.py rounds page sizes; repr keeps every remaining digit
+    return f"{VIRTUAL_BLANK_PREFIX}{round(width, 3)!r}x{round(height, 3)!r}/{name}"
+
+def is_virtual_blank(path):
+    return path.startswith(VIRTUAL_BLANK_PREFIX)
+
+def virtual_blank_metadata(path):
+    """Return the layer metadata of a virtual blank, as inspect_layer would for a real blank PDF."""
+    size = path[len(VIRTUAL_BLANK_PREFIX):].split('/', 1)[0]
+    width, height = (float(value) for value in size.split('x'))
+    return {
+        'version': LAYER_INDEX_VERSION,
+        'virtual': True,
+        'raster': False,
+        'decode_seconds': 0.0,
+        'page_count': 1,
+        'width': width,
+        'height': height,
+        'has_content': False,
+        'colorspaces': [],
+        # Every blank of the same size is identical, so its manifest hash depends only on the size
+        'sha256': hashlib.sha256(f"blank:{size}".encode()).hexdigest(),
+    }
+
+def parse_page_size(text):
+    """
+    Parse a page size in points such as '279x207'.
+    
+    Returns:
+    tuple: (width, height) as floats.
+    """
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*[xX×]\s*(\d+(?:\.\d+)?)\s*', text)
+    if not match:
+        raise ValueError(f"Invalid page size '{text}'. Use WIDTHxHEIGHT in points, e.g. 279x207.")
+    return float(match.group(1)), float(match.group(2))
+
+def load_virtual_blanks(names_path, size=None):
+    """
+    Build a virtual blank layer: one transparent page per name, without writing any files.
+    
+    Virtual blanks stand in for the blank PDFs create_blank_pdf_copies.py would write.
+    They take part in output naming exactly like real files, but are never opened or
+    drawn, since a blank layer adds nothing to the page.
+    
+    Args:
+    names_path (str): A reference directory, whose PDF and image filenames become the names,
+                      or a text file with one name per line.
+    size (tuple, optional): (width, height) in points for every blank. If omitted, each blank
+                            takes the page size of its file in the reference directory.
+    
+    Returns:
+    tuple: A tuple containing two lists - items (virtual blank paths) and filenames.
+    """
+    names_path = sanitize_path(names_path)
+    if os.path.isdir(names_path):
+        filenames = [file for file in os.listdir(names_path) if file.lower().endswith(RASTER_EXTENSIONS + ('.pdf',))]
+    else:
+        with open(names_path, 'r') as names_file:
+            filenames = [line.strip() for line in names_file if line.strip()]
+        if size is None:
+            raise ValueError("A page size is required when the blank names come from a text file.")
+
+    items = []
+    for filename in filenames:
+        if size is not None:
+            width, height = size
+        else:
+            # Only the page geometry is read; the reference file itself is not used as a layer
+            with open_layer_document(os.path.join(names_path, filename)) as document:
+                width, height = document[0].rect.width, document[0].rect.height
+        items.append(virtual_blank_path(width, height, filename))
+    print(f"Created {len(items)} virtual blank layer(s); nothing is written to disk.")
+    return items, filenames
+
+def build_layer_index(layers):
+    """
+    Preflight every layer file once and return its metadata, keyed by path.
+    
+    The index for each directory is persisted as a hidden JSON file next to the
+    layer files. Entries whose file size and modification time are unchanged are
+    reused, so repeat runs only inspect new or edited files.
+    
+    Args:
+    layers (list): List of file path lists, one per layer.
+    
+    Returns:
+    dict: Mapping of file path to its metadata (see inspect_layer).
+    """
+    index = {}
+    paths_by_directory = defaultdict(set)
+    for layer in layers:
+        for path in layer:
+            if is_virtual_blank(path):
+                index[path] = virtual_blank_metadata(path)
+            else:
+                paths_by_directory[os.path.dirname(os.path.abspath(path))].add(path)
+
+    inspected = reused = 0
+    for directory, paths in paths_by_directory.items():
+        index_path = os.path.join(directory, LAYER_INDEX_FILENAME)
+        stored = {}
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, 'r') as index_file:
+                    stored = json.load(index_file)
+            except (OSError, ValueError):
+                print(f"Note: Ignoring unreadable layer index: {index_path}")
+
+        changed = False
+        for path in sorted(paths):
+            stat = os.stat(path)
+            name = os.path.basename(path)
+            entry = stored.get(name)
+            if (entry and entry.get('version') == LAYER_INDEX_VERSION
+                    and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime):
+                reused += 1
+            else:
+                entry = inspect_layer(path)
+                entry['size'], entry['mtime'] = stat.st_size, stat.st_mtime
+                stored[name] = entry
+                inspected += 1
+                changed = True
+            index[path] = entry
+
+        if changed:
+            try:
+                with open(index_path, 'w') as index_file:
+                    json.dump(stored, index_file, indent=2, sort_keys=True)
+            except OSError as e:
+                print(f"Note: Could not save layer index to {index_path}: {e}")
+
+    print(f"Layer preflight: {inspected} file(s) inspected, {reused} reused from saved index.")
+    return index
+
+class LayerCache:
+    """
+    Keep source layer documents open so each file is parsed once per process.
+    
+    Open documents are held in a bounded LRU; the least recently used document is
+    closed once more than `max_open` are held.
+    
+    Args:
+    max_open (int, optional): Maximum number of documents to keep open at once.
+    """
+    def __init__(self, max_open=128):
+        self.max_open = max_open
+        self._documents = OrderedDict()
+
+    def open(self, path):
+        """Return the open document for `path`, parsing it only on first use."""
+        document = self._documents.get(path)
+        if document is not None:
+            self._documents.move_to_end(path)
+            return document
+
+        document = open_layer_document(path)
+        self._documents[path] = document
+        if len(self._documents) > self.max_open:
+            _, evicted = self._documents.popitem(last=False)
+            evicted.close()
+        return document
+
+    def close(self):
+        for document in self._documents.values():
+            document.close()
+        self._documents.clear()
+
+def build_output_filename(filenames, combination, count):
+    """
+    Build the deterministic output filename for a combination.
+    
+    Args:
+    filenames (list): List of filename lists, one per layer.
+    combination (tuple): Index of the chosen file in each layer.
+    count (int): 1-based position of the combination in the full product.
+    
+    Returns:
+    str: The output filename.
+    """
+    combined_filenames = [os.path.splitext(filenames[i][idx])[0] for i, idx in enumerate(combination)]
+    return "_".join(combined_filenames)[:200] + f"_{count}.pdf"
+
+def compose_page(cache, index, layers, combination, target_pdf):
+    """
+    Stack the layers of a single combination onto a new page of `target_pdf`.
+    
+    Args:
+    cache (LayerCache): Cache of open layer documents.
+    index (dict): Layer metadata from build_layer_index.
+    layers (list): List of file path lists, one per layer.
+    combination (tuple): Index of the chosen file in each layer.
+    target_pdf (fitz.Document): Document to append the page to.
+    """
+    # Use the first layer to determine PDF dimensions
+    first_layer = index[layers[0][combination[0]]]
+    pdf_page = target_pdf.new_page(width=first_layer['width'], height=first_layer['height'])
+
+    # Insert layers
+    for i, idx in enumerate(combination):
+        item = layers[i][idx]
+        metadata = index[item]
+        if metadata['has_content']:
+            pdf_page.show_pdf_page(pdf_page.rect, cache.open(item), 0)
+        elif metadata.get('virtual'):
+            continue
+        elif metadata['page_count'] == 0:
+            print(f"Note: PDF with no pages detected: {item}. Using transparent layer.")
+        else:
+            print(f"Note: Empty PDF detected: {item}. Using transparent layer.")
+
+class BackgroundWriter:
+    """
+    Write finished PDFs to disk on dedicated threads so rendering is not stalled by slow storage.
+    
+    Serialized PDFs wait in a bounded queue, which caps memory at roughly
+    `queue_depth` PDFs; `write` blocks when the queue is full. Each file is written
+    under a temporary name and renamed into place, so a partial file never appears
+    under its final name.
+    
+    Args:
+    threads (int): Number of writer threads.
+    queue_depth (int, optional): Maximum number of serialized PDFs waiting to be written.
+    """
+    def __init__(self, threads, queue_depth=16):
+        self._queue = queue.Queue(maxsize=queue_depth)
+        self._errors = []
+        self._threads = [threading.Thread(target=self._run, daemon=True) for _ in range(threads)]
+        for thread in self._threads:
+            thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                path, data = item
+                temp_path = path + '.part'
+                with open(temp_path, 'wb') as output_file:
+                    output_file.write(data)
+                os.replace(temp_path, path)
+            except Exception as e:
+                self._errors.append(e)
+            finally:
+                self._queue.task_done()
+
+    def write(self, path, data):
+        if self._errors:
+            raise self._errors[0]
+        self._queue.put((path, data))
+
+    def flush(self):
+        """Block until every queued PDF is on disk, re-raising the first write error."""
+        self._queue.join()
+        if self._errors:
+            raise self._errors[0]
+
+    def close(self):
+        self.flush()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+def save_pdf(pdf, output_path, writer=None):
+    """Save a PDF directly, or serialize it and hand it to a BackgroundWriter."""
+    if writer is None:
+        pdf.save(output_path, **SAVE_OPTIONS)
+    else:
+        writer.write(output_path, pdf.tobytes(**SAVE_OPTIONS))
+
+def render_combination(cache, index, layers, combination, output_path, writer=None):
+    """
+    Stack the layers of a single combination and save the result as a PDF.
+    
+    Args:
+    cache (LayerCache): Cache of open layer documents.
+    index (dict): Layer metadata from build_layer_index.
+    layers (list): List of file path lists, one per layer.
+    combination (tuple): Index of the chosen file in each layer.
+    output_path (str): Path to save the merged PDF.
+    writer (BackgroundWriter, optional): Writer to hand the serialized PDF to instead of saving inline.
+    """
+    new_pdf = fitz.open()
+    compose_page(cache, index, layers, combination, new_pdf)
+    save_pdf(new_pdf, output_path, writer)
+    new_pdf.close()
+
+def render_bundle(cache, index, layers, chunk, output_dir, writer=None):
+    """
+    Render several combinations as the pages of one PDF, plus a CSV page index.
+    
+    Pages that show the same source layer share a single copy of it, so a bundle
+    embeds each background and border once instead of once per card.
+    
+    Args:
+    cache (LayerCache): Cache of open layer documents.
+    index (dict): Layer metadata from build_layer_index.
+    layers (list): List of file path lists, one per layer.
+    chunk (list): (combination, output_filename, manifest entry) for each card in the bundle.
+    output_dir (str): Directory to save the bundle.
+    writer (BackgroundWriter, optional): Writer to hand the serialized PDF to instead of saving inline.
+    
+    Returns:
+    str: The bundle filename.
+    """
+    card_filenames = [output_filename for _, output_filename, _ in chunk]
+    first_count = os.path.splitext(card_filenames[0])[0].rsplit('_', 1)[-1]
+    digest = hashlib.sha1("\n".join(card_filenames).encode('utf-8')).hexdigest()[:8]
+    bundle_filename = f"bundle_{int(first_count):06d}_{digest}.pdf"
+
+    bundle_pdf = fitz.open()
+    for combination, _, _ in chunk:
+        compose_page(cache, index, layers, combination, bundle_pdf)
+    save_pdf(bundle_pdf, os.path.join(output_dir, bundle_filename), writer)
+    bundle_pdf.close()
+
+    with open(os.path.join(output_dir, os.path.splitext(bundle_filename)[0] + '.csv'), 'w', newline='') as csvfile:
+        index_writer = csv.writer(csvfile)
+        index_writer.writerow(['page', 'card_filename'])
+        for page_number, card_filename in enumerate(card_filenames, 1):
+            index_writer.writerow([page_number, card_filename])
+
+    return bundle_filename
+
+def split_bundle(bundle_path, output_dir):
+    """
+    Split a bundle back into one PDF per card, named from its CSV page index.
+    
+    Args:
+    bundle_path (str): Path to the bundle PDF.
+    output_dir (str): Directory to save the per-card PDFs.
+    """
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    num_layers = len(layers)
-    if num_layers not in [2, 3]:
-        raise ValueError("This script supports only 2 or 3 layers.")
+    with open(os.path.splitext(bundle_path)[0] + '.csv', 'r') as csvfile:
+        rows = list(csv.DictReader(csvfile))
+
+    with fitz.open(bundle_path) as bundle_pdf:
+        for row in tqdm(rows, desc="Splitting bundle"):
+            page_number = int(row['page']) - 1
+            card_pdf = fitz.open()
+            card_pdf.insert_pdf(bundle_pdf, from_page=page_number, to_page=page_number)
+            card_pdf.save(os.path.join(output_dir, row['card_filename']), **SAVE_OPTIONS)
+            card_pdf.close()
+    print(f"Split {len(rows)} card(s) from {os.path.basename(bundle_path)}.")
+
+MANIFEST_FILENAME = ".merge_manifest.jsonl"
+
+def manifest_filename(shard=None):
+    """Return the manifest filename, which is kept separate per shard so nodes can share an output directory."""
+    if shard is None:
+        return MANIFEST_FILENAME
+    return f".merge_manifest.shard-{shard[0]}-of-{shard[1]}.jsonl"
+
+def _manifest_records(output_dir, shard=None):
+    # A partially written last line from an interrupted run is skipped
+    manifest_path = os.path.join(output_dir, manifest_filename(shard))
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as manifest_file:
+            for line in manifest_file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+def load_manifest(output_dir, shard=None):
+    """
+    Load the render manifest of an output directory.
+    
+    The manifest is an append-only JSON Lines file, so an interrupted run leaves
+    every completed entry intact; a partially written last line is ignored.
+    
+    Args:
+    output_dir (str): Directory containing the merged PDFs.
+    shard (tuple, optional): (shard number, shard count) whose manifest to load.
+    
+    Returns:
+    dict: Mapping of output filename to its manifest entry.
+    """
+    manifest = {}
+    for record in _manifest_records(output_dir, shard):
+        if 'output' in record:
+            manifest[record['output']] = record['entry']
+    return manifest
+
+def load_bundles(output_dir, shard=None):
+    """
+    Load the cards each bundle in an output directory was written with.
+    
+    Bundles are listed in the manifest as they are written. Manifests from before
+    that are covered by the bundle each card entry points to.
+    
+    Args:
+    output_dir (str): Directory containing the bundles.
+    shard (tuple, optional): (shard number, shard count) whose manifest to load.
+    
+    Returns:
+    dict: Mapping of bundle filename to the list of card filenames on its pages.
+    """
+    bundles = defaultdict(list)
+    for record in _manifest_records(output_dir, shard):
+        if 'bundle' in record:
+            bundles[record['bundle']] = list(record['cards'])
+        elif 'bundle' in record['entry'] and record['output'] not in bundles[record['entry']['bundle']]:
+            bundles[record['entry']['bundle']].append(record['output'])
+    return dict(bundles)
+
+def build_manifest_entry(index, items, settings):
+    """Describe an output by the content hashes of its input layers and the render settings."""
+    return {'inputs': [index[item]['sha256'] for item in items], 'settings': settings}
+
+def append_manifest_entry(manifest_file, output_filename, entry):
+    manifest_file.write(json.dumps({'output': output_filename, 'entry': entry}) + "\n")
+    manifest_file.flush()
+
+def append_bundle_record(manifest_file, bundle_filename, card_filenames):
+    manifest_file.write(json.dumps({'bundle': bundle_filename, 'cards': card_filenames}) + "\n")
+    manifest_file.flush()
+
+def remove_bundle(output_dir, bundle_filename):
+    """Delete a bundle PDF and its CSV page index, if they exist."""
+    for path in (bundle_filename, os.path.splitext(bundle_filename)[0] + '.csv'):
+        if os.path.exists(os.path.join(output_dir, path)):
+            os.remove(os.path.join(output_dir, path))
+
+def is_up_to_date(manifest, output_dir, output_filename, entry):
+    """Return True if the output (or the bundle holding it) exists and was rendered from the same inputs and settings."""
+    recorded = manifest.get(output_filename)
+    if recorded is None or recorded['inputs'] != entry['inputs'] or recorded['settings'] != entry['settings']:
+        return False
+    return os.path.exists(os.path.join(output_dir, recorded.get('bundle', output_filename)))
+
+def parse_shard(text):
+    """
+    Parse a shard specification such as '3/8'.
+    
+    Returns:
+    tuple: (shard number, shard count), with the shard number counted from 1.
+    """
+    try:
+        number, count = (int(part) for part in text.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{text}'. Use the form NUMBER/COUNT, e.g. 3/8.")
+    if not 1 <= number <= count:
+        raise ValueError(f"Invalid shard '{text}'. The shard number must be between 1 and {count}.")
+    return number, count
+
+def shard_range(shard, total_combinations):
+    """Return the [start, stop) range of combination ranks assigned to a shard."""
+    number, count = shard
+    return total_combinations * (number - 1) // count, total_combinations * number // count
+
+def unrank_combination(rank, sizes):
+    """
+    Return the combination at position `rank` of itertools.product over the given sizes.
+    
+    The last layer varies fastest, exactly as in itertools.product, so a shard can
+    jump straight to its slice of the product without iterating over earlier ones.
+    
+    Args:
+    rank (int): 0-based position in the product.
+    sizes (list): Number of files in each layer.
+    
+    Returns:
+    tuple: Index of the chosen file in each layer.
+    """
+    combination = []
+    for size in reversed(sizes):
+        rank, idx = divmod(rank, size)
+        combination.append(idx)
+    return tuple(reversed(combination))
+
+def iter_ranked_combinations(sizes, start, stop):
+    """Yield (count, combination) for ranks in [start, stop), with count being the 1-based rank."""
+    for rank in range(start, stop):
+        yield rank + 1, unrank_combination(rank, sizes)
+
+class CombinationRules:
+    """
+    Include/exclude rules that prune combinations before anything is opened or rendered.
+    
+    Rules are read from a JSON file. Layers are numbered from 1, as in the prompts:
+    
+        {
+          "fields": {
+            "1": "^(?P<edition>Bronze|Silver) v2 - (?P<theme>.+)\\.pdf$",
+            "3": "(?P<edition>Bronze|Silver) Border"
+          },
+          "exclude": [
+            {"layers": {"1": "Silver*", "3": "*Bronze*"}},
+            {"differ": ["edition"]}
+          ]
+        }
+    
+    A predicate is one of:
+    - {"layers": {"<layer>": "<glob>", ...}}: every listed layer's filename matches its glob.
+    - {"same": ["<field>", ...]}: every layer that defines the field has the same value.
+    - {"differ": ["<field>", ...]}: the layers that define a field do not all agree.
+    Fields are named groups of the per-layer regex in "fields". A combination is
+    kept if it matches any "include" predicate (or there are none) and no "exclude"
+    predicate.
+    
+    Args:
+    rules (dict): The parsed rules file.
+    filenames (list): List of filename lists, one per layer.
+    """
+    def __init__(self, rules, filenames):
+        self.filenames = filenames
+        # Named fields parsed from each file, computed once per file rather than per combination
+        self.fields = [[{} for _ in layer] for layer in filenames]
+        for layer_number, pattern in rules.get('fields', {}).items():
+            layer = int(layer_number) - 1
+            regex = re.compile(pattern)
+            for idx, filename in enumerate(filenames[layer]):
+                match = regex.search(filename)
+                if match:
+                    self.fields[layer][idx] = {key: value for key, value in match.groupdict().items() if value is not None}
+        self.include = [self._compile(predicate) for predicate in rules.get('include', [])]
+        self.exclude = [self._compile(predicate) for predicate in rules.get('exclude', [])]
+
+    @classmethod
+    def from_file(cls, path, filenames):
+        with open(path, 'r') as rules_file:
+            return cls(json.load(rules_file), filenames)
+
+    def _compile(self, predicate):
+        if 'layers' in predicate:
+            # Reduce each glob to the set of file indices it matches in its layer
+            allowed = {}
+            for layer_number, pattern in predicate['layers'].items():
+                layer = int(layer_number) - 1
+                allowed[layer] = {idx for idx, filename in enumerate(self.filenames[layer]) if fnmatch.fnmatch(filename, pattern)}
+            return lambda combination: all(combination[layer] in indices for layer, indices in allowed.items())
+        if 'same' in predicate:
+            return lambda combination: all(len(self._values(combination, field)) <= 1 for field in predicate['same'])
+        if 'differ' in predicate:
+            return lambda combination: any(len(self._values(combination, field)) > 1 for field in predicate['differ'])
+        raise ValueError(f"Unknown rule predicate: {predicate}")
+
+    def _values(self, combination, field):
+        return {self.fields[layer][idx][field] for layer, idx in enumerate(combination) if field in self.fields[layer][idx]}
+
+    def allows(self, combination):
+        if self.include and not any(predicate(combination) for predicate in self.include):
+            return False
+        return not any(predicate(combination) for predicate in self.exclude)
+
+    def survey(self, sizes, start, stop):
+        """
+        Evaluate the rules over ranks [start, stop) without opening any files.
+        
+        Returns:
+        tuple: (number of pruned combinations, set of (layer, index) pairs used by allowed combinations).
+        """
+        pruned, used = 0, set()
+        for _, combination in iter_ranked_combinations(sizes, start, stop):
+            if self.allows(combination):
+                used.update(enumerate(combination))
+            else:
+                pruned += 1
+        return pruned, used
+
+def write_shard_record(output_dir, shard, total_combinations, pruned=0):
+    start, stop = shard_range(shard, total_combinations)
+    record = {'shard': shard[0], 'shards': shard[1], 'total': total_combinations, 'start': start, 'stop': stop, 'pruned': pruned}
+    with open(os.path.join(output_dir, f".merge_shard-{shard[0]}-of-{shard[1]}.json"), 'w') as record_file:
+        json.dump(record, record_file, indent=2)
+
+def verify_shards(manifest_dir):
+    """
+    Check that the shard manifests in a directory cover the full product exactly once.
+    
+    Copy the shard records (.merge_shard-*.json) and manifests
+    (.merge_manifest.shard-*.jsonl) from every render node into one directory first.
+    
+    Args:
+    manifest_dir (str): Directory containing the shard records and manifests.
+    
+    Returns:
+    bool: True if every combination was rendered by exactly one shard.
+    """
+    records = []
+    for filename in os.listdir(manifest_dir):
+        if filename.startswith('.merge_shard-') and filename.endswith('.json'):
+            with open(os.path.join(manifest_dir, filename), 'r') as record_file:
+                records.append(json.load(record_file))
+    if not records:
+        print("No shard records found.")
+        return False
+
+    problems = []
+    shard_counts = {record['shards'] for record in records}
+    totals = {record['total'] for record in records}
+    if len(shard_counts) > 1 or len(totals) > 1:
+        problems.append(f"Shard records disagree: shard counts {sorted(shard_counts)}, totals {sorted(totals)}.")
+    else:
+        shard_count, total_combinations = shard_counts.pop(), totals.pop()
+        present = sorted(record['shard'] for record in records)
+        missing_shards = sorted(set(range(1, shard_count + 1)) - set(present))
+        if missing_shards:
+            problems.append(f"Missing shard records: {missing_shards}")
+        if len(present) != len(set(present)):
+            problems.append("Some shards have more than one record.")
+
+        # Every count suffix from 1 to the total must appear in exactly one shard manifest
+        seen = defaultdict(list)
+        for record in records:
+            shard = (record['shard'], record['shards'])
+            for output_filename in load_manifest(manifest_dir, shard):
+                count = int(os.path.splitext(output_filename)[0].rsplit('_', 1)[-1])
+                seen[count].append(record['shard'])
+                if not record['start'] < count <= record['stop']:
+                    problems.append(f"{output_filename} is outside the range of shard {record['shard']}.")
+        duplicates = [count for count, shards in seen.items() if len(shards) > 1]
+        if duplicates:
+            problems.append(f"{len(duplicates)} combination(s) rendered by more than one shard, e.g. #{sorted(duplicates)[0]}.")
+        # Combinations pruned by rules are expected to be absent, but no others
+        for record in records:
+            missing = [count for count in range(record['start'] + 1, record['stop'] + 1) if count not in seen]
+            if len(missing) != record.get('pruned', 0):
+                problems.append(f"Shard {record['shard']}: {len(missing)} combination(s) not rendered (e.g. #{missing[0] if missing else '-'}), "
+                                f"but {record.get('pruned', 0)} were pruned by rules.")
+
+    if problems:
+        print("Shard verification FAILED:")
+        for problem in problems:
+            print(f"  - {problem}")
+        return False
+    pruned = sum(record.get('pruned', 0) for record in records)
+    print(f"Shard verification passed: {len(records)} shard(s) cover all {total_combinations} combinations exactly once"
+          + (f" ({pruned} pruned by rules)." if pruned else "."))
+    return True
+
+# Layer lists shared with each worker process, set once by the pool initializer
+_worker_state = {}
+
+def _init_combination_worker(index, layers, output_dir, writer_threads):
+    _worker_state['index'] = index
+    _worker_state['layers'] = layers
+    _worker_state['output_dir'] = output_dir
+    _worker_state['cache'] = LayerCache()
+    _worker_state['writer'] = BackgroundWriter(writer_threads) if writer_threads else None
+
+def render_chunk(cache, index, layers, output_dir, chunk, bundle, writer=None):
+    """
+    Render a chunk of combinations, either as one bundle or as one PDF each.
+    
+    With a writer, disk writes overlap with composing the rest of the chunk; the
+    chunk only returns once all of its files are on disk, so the caller can safely
+    record them in the manifest.
+    
+    Returns:
+    str: The bundle filename, or None if each card was saved separately.
+    """
+    bundle_filename = None
+    if bundle:
+        bundle_filename = render_bundle(cache, index, layers, chunk, output_dir, writer)
+    else:
+        for combination, output_filename, _ in chunk:
+            render_combination(cache, index, layers, combination, os.path.join(output_dir, output_filename), writer)
+    if writer is not None:
+        writer.flush()
+    return bundle_filename
+
+def _render_combination_chunk(chunk, bundle):
+    return render_chunk(_worker_state['cache'], _worker_state['index'], _worker_state['layers'],
+                        _worker_state['output_dir'], chunk, bundle, _worker_state['writer'])
+
+def chunked(iterable, size):
+    """Yield successive lists of at most `size` items from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def report_raster_savings(index, raster_uses, decodes_per_file):
+    """
+    Print an estimate of the decode time saved by reusing decoded raster layers.
+    
+    Each raster file is decoded at most once per process, where it used to be
+    decoded once for every card it appeared in. The saving is estimated from the
+    decode time measured during preflight.
+    
+    Args:
+    index (dict): Layer metadata from build_layer_index.
+    raster_uses (Counter): Number of rendered cards each raster file appeared in.
+    decodes_per_file (int): Number of times each raster file is decoded (one per process).
+    """
+    if not raster_uses:
+        return
+    saved = sum(index[path]['decode_seconds'] * max(0, uses - decodes_per_file) for path, uses in raster_uses.items())
+    print(f"Raster layers: {len(raster_uses)} file(s) used in {sum(raster_uses.values())} card(s) were decoded once per process; "
+          f"estimated {saved:.1f}s of decoding saved.")
+
+def generate_combinations(layers, filenames, output_dir, workers=1, shard=None, bundle_size=0, writer_threads=0, rules=None):
+    """
+    Generate every combination of the given layers and save each as a PDF.
+    
+    Any number of layers is supported. Each card is stacked bottom to top in a
+    single pass, and combinations are streamed from the product, so no
+    intermediate files are written between layers.
+    
+    Outputs listed in the output directory's manifest with unchanged input hashes
+    and settings are skipped, so an interrupted or repeated run only renders
+    combinations that are missing or whose inputs have changed. A bundle holding
+    any such combination is re-rendered whole and the old bundle is removed.
+    
+    Args:
+    layers (list): List of file path lists, one per layer.
+    filenames (list): List of filename lists, one per layer.
+    output_dir (str): Directory to save the merged PDFs.
+    workers (int, optional): Number of worker processes. 1 renders in this process.
+    shard (tuple, optional): (shard number, shard count) to render only one slice of the product.
+    bundle_size (int, optional): If set, save this many cards per multi-page bundle PDF.
+    writer_threads (int, optional): If set, write PDFs on this many background threads per process.
+    rules (CombinationRules, optional): Rules for pruning combinations before they are rendered.
+    """
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    if len(layers) < 2:
+        raise ValueError("At least 2 layers are required.")
 
     total_combinations = 1
     for layer in layers:
         total_combinations *= len(layer)
     print(f"\nTotal combinations to generate: {total_combinations}")
 
-    combinations = itertools.product(*[range(len(layer)) for layer in layers])
+    start, stop = 0, total_combinations
+    if shard is not None:
+        start, stop = shard_range(shard, total_combinations)
+        print(f"Shard {shard[0]}/{shard[1]}: combinations {start + 1} to {stop}")
+
+    sizes = [len(layer) for layer in layers]
+    pruned = 0
+    used_layers = layers
+    if rules is not None:
+        pruned, used = rules.survey(sizes, start, stop)
+        used_layers = [[path for idx, path in enumerate(layer) if (i, idx) in used] for i, layer in enumerate(layers)]
+        print(f"Rules pruned {pruned} combination(s); {stop - start - pruned} remain to be rendered.")
+    if shard is not None:
+        write_shard_record(output_dir, shard, total_combinations, pruned)
+
+    # Files only used by pruned combinations are never opened
+    index = build_layer_index(used_layers)
+    manifest = load_manifest(output_dir, shard)
+    settings = dict(SAVE_OPTIONS, mode='combine-bundle' if bundle_size else 'combine')
+    skipped = 0
+    raster_uses = Counter()
 
-    for count, combination in enumerate(tqdm(combinations, total=total_combinations), 1):
-        combined_filenames = [os.path.splitext(filenames[i][idx])[0] for i, idx in enumerate(combination)]
+    # Counts are assigned here, before any work is distributed, so output names
+    # are identical no matter how many workers or shards are used
+    def card_entries():
+        combinations = iter_ranked_combinations(sizes, start, stop)
+        if rules is not None:
+            combinations = ((count, combination) for count, combination in combinations if rules.allows(combination))
+        for count, combination in combinations:
+            output_filename = build_output_filename(filenames, combination, count)
+            entry = build_manifest_entry(index, [layers[i][idx] for i, idx in enumerate(combination)], settings)
+            yield combination, output_filename, entry
 
-        new_pdf = fitz.open()
+    # A bundle is superseded once any of its cards is stale or has been moved to
+    # another bundle. Its remaining cards are re-rendered with the stale ones, and
+    # the old PDF and page index are removed once the run completes.
+    bundles = load_bundles(output_dir, shard)
+    superseded = set()
+    if bundles:
+        superseded = {bundle_filename for bundle_filename, card_filenames in bundles.items()
+                      if any(manifest.get(card_filename, {}).get('bundle') != bundle_filename for card_filename in card_filenames)}
+        for _, output_filename, entry in card_entries():
+            recorded_bundle = manifest.get(output_filename, {}).get('bundle')
+            if recorded_bundle and not is_up_to_date(manifest, output_dir, output_filename, entry):
+                superseded.add(recorded_bundle)
+        superseded = {bundle_filename for bundle_filename in superseded if os.path.exists(os.path.join(output_dir, bundle_filename))}
+    written = set()
 
-        # Use the first layer to determine PDF dimensions
-        with fitz.open(layers[0][combination[0]]) as first_pdf:
-            pdf_width, pdf_height = first_pdf[0].rect.width, first_pdf[0].rect.height
+    with open(os.path.join(output_dir, manifest_filename(shard)), 'a') as manifest_file, \
+            tqdm(total=stop - start - pruned) as progress:
 
-        pdf_page = new_pdf.new_page(width=pdf_width, height=pdf_height)
+        def stale_combinations():
+            nonlocal skipped
+            for combination, output_filename, entry in card_entries():
+                if (manifest.get(output_filename, {}).get('bundle') not in superseded
+                        and is_up_to_date(manifest, output_dir, output_filename, entry)):
+                    skipped += 1
+                    progress.update(1)
+                    continue
+                yield combination, output_filename, entry
 
-        # Insert layers
+        def record(chunk, bundle_filename):
+            for combination, output_filename, entry in chunk:
+                for i, idx in enumerate(combination):
+                    if index[layers[i][idx]]['raster']:
+                        raster_uses[layers[i][idx]] += 1
+                if bundle_filename:
+                    entry = dict(entry, bundle=bundle_filename)
+                append_manifest_entry(manifest_file, output_filename, entry)
+            if bundle_filename:
+                append_bundle_record(manifest_file, bundle_filename, [output_filename for _, output_filename, _ in chunk])
+                written.add(bundle_filename)
+            progress.update(len(chunk))
+
+        bundle = bundle_size > 0
+        if workers <= 1:
+            # Writes can only overlap with rendering within a chunk, so chunk up when pipelining
+            chunk_size = bundle_size if bundle else (max(1, min(64, (stop - start - pruned) // 8)) if writer_threads else 1)
+            cache = LayerCache()
+            writer = BackgroundWriter(writer_threads) if writer_threads else None
+            try:
+                for chunk in chunked(stale_combinations(), chunk_size):
+                    record(chunk, render_chunk(cache, index, layers, output_dir, chunk, bundle, writer))
+            finally:
+                cache.close()
+                if writer is not None:
+                    writer.close()
+        else:
+            # Small chunks keep every worker busy until the end; in-flight chunks are
+            # capped so the product is never materialized in memory
+            chunk_size = bundle_size if bundle else max(1, min(64, (stop - start - pruned) // (workers * 8)))
+            max_in_flight = workers * 4
+            print(f"Rendering with {workers} worker processes...")
+
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_combination_worker,
+                                     initargs=(index, layers, output_dir, writer_threads)) as executor:
+                pending = {}
+                for chunk in chunked(stale_combinations(), chunk_size):
+                    if len(pending) >= max_in_flight:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            record(pending.pop(future), future.result())
+                    pending[executor.submit(_render_combination_chunk, chunk, bundle)] = chunk
+                for future in as_completed(list(pending)):
+                    record(pending.pop(future), future.result())
+
+    # A re-rendered bundle with the same cards keeps its name and was replaced in place
+    for bundle_filename in sorted(superseded - written):
+        remove_bundle(output_dir, bundle_filename)
+    if superseded:
+        print(f"Replaced {len(superseded)} bundle(s) that held stale cards.")
+    if skipped:
+        print(f"Skipped {skipped} up-to-date combination(s) recorded in the manifest.")
+    report_raster_savings(index, raster_uses, max(1, workers))
+
+def rasterize_layer_thumbnail(path, metadata, size):
+    """
+    Rasterize the first page of a layer file once, at thumbnail size.
+    
+    Args:
+    path (str): Path to the layer file.
+    metadata (dict): The file's entry from build_layer_index.
+    size (tuple): (width, height) of the thumbnail in pixels.
+    
+    Returns:
+    PIL.Image.Image: RGBA thumbnail, or None if the layer has no content.
+    """
+    if not metadata['has_content']:
+        return None
+    with open_layer_document(path) as document:
+        page = document[0]
+        zoom = size[0] / page.rect.width
+        pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=True)
+        thumbnail = Image.frombytes("RGBA", (pixmap.width, pixmap.height), pixmap.samples)
+    return thumbnail.resize(size)
+
+def generate_proof_sheets(layers, filenames, output_dir, thumb_width=200, columns=6, rows=8, rules=None):
+    """
+    Build paginated low-resolution contact sheets of every combination without rendering full PDFs.
+    
+    Each distinct layer file is rasterized once at thumbnail size; every
+    combination is then a cheap alpha composite of those thumbnails, labelled with
+    the filename the full render would produce.
+    
+    Args:
+    layers (list): List of file path lists, one per layer.
+    filenames (list): List of filename lists, one per layer.
+    output_dir (str): Directory to save the contact sheet PNGs.
+    thumb_width (int, optional): Width of each card thumbnail in pixels.
+    columns (int, optional): Number of cards per sheet row.
+    rows (int, optional): Number of card rows per sheet.
+    rules (CombinationRules, optional): Rules for pruning combinations before they are proofed.
+    """
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    sizes = [len(layer) for layer in layers]
+    total_combinations = 1
+    for size in sizes:
+        total_combinations *= size
+    combinations = iter_ranked_combinations(sizes, 0, total_combinations)
+    used_layers = layers
+    proofed = total_combinations
+    if rules is not None:
+        pruned, used = rules.survey(sizes, 0, total_combinations)
+        used_layers = [[path for idx, path in enumerate(layer) if (i, idx) in used] for i, layer in enumerate(layers)]
+        combinations = ((count, combination) for count, combination in combinations if rules.allows(combination))
+        proofed -= pruned
+        print(f"Rules pruned {pruned} combination(s); {proofed} remain to be proofed.")
+
+    index = build_layer_index(used_layers)
+    first_layer = index[next(path for layer in used_layers for path in layer)]
+    thumb_size = (thumb_width, round(thumb_width * first_layer['height'] / first_layer['width']))
+
+    thumbnails = {}
+    for path in tqdm({path for layer in used_layers for path in layer}, desc="Rasterizing layers"):
+        thumbnails[path] = rasterize_layer_thumbnail(path, index[path], thumb_size)
+
+    per_sheet = columns * rows
+    label_height = 36
+    cell_width, cell_height = thumb_size[0] + 10, thumb_size[1] + label_height + 10
+    font = ImageFont.load_default()
+    blank = Image.new("RGBA", thumb_size, (255, 255, 255, 255))
+
+    sheet, draw, sheet_number = None, None, 0
+    for number, (count, combination) in enumerate(tqdm(combinations, total=proofed, desc="Building proofs")):
+        position = number % per_sheet
+        if position == 0:
+            if sheet is not None:
+                sheet.save(os.path.join(output_dir, f"proof_sheet_{sheet_number:04d}.png"))
+            sheet_number += 1
+            sheet = Image.new("RGB", (columns * cell_width, rows * cell_height), "white")
+            draw = ImageDraw.Draw(sheet)
+
+        card = blank
         for i, idx in enumerate(combination):
-            item = layers[i][idx]
-            with fitz.open(item) as overlay_pdf:
-                if overlay_pdf.page_count > 0:
-                    # Check if the page is empty by looking for any content
-                    page = overlay_pdf[0]
-                    if page.get_text() or page.get_drawings() or page.get_images():
-                        pdf_page.show_pdf_page(pdf_page.rect, overlay_pdf, 0)
-                    else:
-                        print(f"Note: Empty PDF detected: {item}. Using transparent layer.")
-                else:
-                    print(f"Note: PDF with no pages detected: {item}. Using transparent layer.")
+            thumbnail = thumbnails[layers[i][idx]]
+            if thumbnail is not None:
+                card = Image.alpha_composite(card, thumbnail)
+
+        x, y = (position % columns) * cell_width + 5, (position // columns) * cell_height + 5
+        sheet.paste(card.convert("RGB"), (x, y))
+        label = build_output_filename(filenames, combination, count)
+        label_lines = textwrap.wrap(label, width=thumb_width // 6)[:3]
+        draw.multiline_text((x, y + thumb_size[1] + 2), "\n".join(label_lines), fill="black", font=font, spacing=1)
 
-        output_filename = "_".join(combined_filenames)[:200] + f"_{count}.pdf"
-        new_pdf.save(os.path.join(output_dir, output_filename), garbage=4, deflate=True)
-        new_pdf.close()
+    if sheet is not None:
+        sheet.save(os.path.join(output_dir, f"proof_sheet_{sheet_number:04d}.png"))
+    print(f"Created {sheet_number} contact sheet(s) covering {proofed} combinations.")
 
-def merge_layers(layer1, filenames1, layer2, filenames2, output_dir):
+def merge_layers(layers, filenames, output_dir, writer_threads=0):
     """
-    Merge two layers of PDFs in a 1-for-1 fashion with concatenated filenames.
+    Merge any number of layers of PDFs in a 1-for-1 fashion with concatenated filenames.
     
     Args:
-    layer1 (list): List of file paths for the first layer.
-    filenames1 (list): List of filenames for the first layer.
-    layer2 (list): List of file paths for the second layer.
-    filenames2 (list): List of filenames for the second layer.
+    layers (list): List of file path lists, one per layer, stacked bottom to top.
+    filenames (list): List of filename lists, one per layer.
     output_dir (str): Directory to save the merged PDFs.
+    writer_threads (int, optional): If set, write PDFs on this many background threads.
     """
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    total_files = min(len(layer1), len(layer2))
-    for i in tqdm(range(total_files), desc="Merging layers"):
-        output_filename = f"{os.path.splitext(filenames1[i])[0]}_-_{os.path.splitext(filenames2[i])[0]}.pdf"
-        new_pdf = fitz.open()
-
-        # Determine PDF dimensions from first layer
-        with fitz.open(layer1[i]) as pdf1:
-            pdf_width, pdf_height = pdf1[0].rect.width, pdf1[0].rect.height
+    index = build_layer_index(layers)
+    manifest = load_manifest(output_dir)
+    settings = dict(SAVE_OPTIONS, mode='merge')
+    skipped = 0
+    cache = LayerCache()
+    writer = BackgroundWriter(writer_threads) if writer_threads else None
+    # Entries are only recorded once their files are on disk
+    written = []
+    total_files = min(len(layer) for layer in layers)
+    with open(os.path.join(output_dir, MANIFEST_FILENAME), 'a') as manifest_file:
+        for i in tqdm(range(total_files), desc="Merging layers"):
+            output_filename = "_-_".join(os.path.splitext(layer_filenames[i])[0] for layer_filenames in filenames) + ".pdf"
+            entry = build_manifest_entry(index, [layer[i] for layer in layers], settings)
+            if is_up_to_date(manifest, output_dir, output_filename, entry):
+                skipped += 1
+                continue
 
-        pdf_page = new_pdf.new_page(width=pdf_width, height=pdf_height)
+            render_combination(cache, index, layers, (i,) * len(layers), os.path.join(output_dir, output_filename), writer)
+            written.append((output_filename, entry))
+            if writer is None or len(written) >= 64:
+                if writer is not None:
+                    writer.flush()
+                for output_filename, entry in written:
+                    append_manifest_entry(manifest_file, output_filename, entry)
+                written = []
 
-        # Insert layers
-        for item in [layer1[i], layer2[i]]:
-            with fitz.open(item) as pdf:
-                if len(pdf) > 0:
-                    pdf_page.show_pdf_page(pdf_page.rect, pdf, 0)
+        if writer is not None:
+            writer.close()
+        for output_filename, entry in written:
+            append_manifest_entry(manifest_file, output_filename, entry)
+    cache.close()
 
-        new_pdf.save(os.path.join(output_dir, output_filename), garbage=4, deflate=True)
-        new_pdf.close()
+    if skipped:
+        print(f"Skipped {skipped} up-to-date file(s) recorded in the manifest.")
 
 def main():
     print_welcome_message()
     try:
         # Get user input
-        numLayers = int(input("Enter the number of layers (2 or 3): "))
-        if numLayers not in [2, 3]:
-            raise ValueError("This script supports only 2 or 3 layers.")
+        layers_input = input("Enter the number of layers (2 or more), 'verify' to check the shard manifests of a split COMBINE run, or 'split' to split a card bundle: ").strip().lower()
+        if layers_input == 'verify':
+            verify_shards(sanitize_path(input("Enter the folder containing the shard records and manifests from every node: ")))
+            return
+        if layers_input == 'split':
+            bundle_path = sanitize_path(input("Enter the path to the bundle PDF: "))
+            split_bundle(bundle_path, sanitize_path(input("Where do you want the per-card PDFs to output: ")))
+            return
+        numLayers = int(layers_input)
+        if numLayers < 2:
+            raise ValueError("At least 2 layers are required.")
 
         outputInput = sanitize_path(input("Where do you want the images to output: "))
-        layerPaths = [sanitize_path(input(f'Enter the folder (or file) path for layer {i + 1}: ')) for i in range(numLayers)]
+        layerPaths = []
+        # Virtual blank layers by layer number, built from the reference names the user gives for them
+        blank_layers = {}
+        for i in range(numLayers):
+            path_input = input(f"Enter the folder (or file) path for layer {i + 1}, or 'blank' for a virtual blank layer: ").strip()
+            if path_input.lower() == 'blank':
+                names_path = input("Enter a reference folder whose filenames name the blanks, or a text file with one name per line: ")
+                size_input = input("Enter the blank page size in points (e.g., 279x207), or press Enter to use each reference file's size: ").strip()
+                blank_layers[i] = load_virtual_blanks(names_path, parse_page_size(size_input) if size_input else None)
+                layerPaths.append(path_input)
+            else:
+                layerPaths.append(sanitize_path(path_input))
 
         layersPath, all_filenames = [], []
         for i, path in enumerate(layerPaths):
             print(f"Working on Layer {i + 1}...")
-            replicate_count = None if not os.path.isfile(path) or i == len(layerPaths) - 1 else len(os.listdir(layerPaths[i + 1]))
-            items, filenames = load_variations(path, replicate_count)
+            if i in blank_layers:
+                items, filenames = blank_layers[i]
+            else:
+                # A single file is repeated once per variation of the next layer
+                if i + 1 in blank_layers:
+                    next_count = len(blank_layers[i + 1][0])
+                elif i < len(layerPaths) - 1 and os.path.isdir(layerPaths[i + 1]):
+                    next_count = len(os.listdir(layerPaths[i + 1]))
+                else:
+                    next_count = None
+                replicate_count = next_count if os.path.isfile(path) else None
+                items, filenames = load_variations(path, replicate_count)
             layersPath.append(items)
             all_filenames.append(filenames)
 
@@ -178,21 +1194,45 @@ def main():
         print("\nWhat would you like to do?")
         print("1. MERGE - Perform a 1-for-1 merge of corresponding images")
         print("2. COMBINE - Generate all possible combinations of layers")
+        print("3. PROOF - Preview all combinations on low-resolution contact sheets (no PDFs are written)")
 
         while True:
-            choice = input("Enter your choice (1 or 2): ")
+            choice = input("Enter your choice (1, 2 or 3): ")
             if choice == '1':
                 merge_method = 'merge'
                 break
             elif choice == '2':
                 merge_method = 'combine'
                 break
+            elif choice == '3':
+                merge_method = 'proof'
+                break
             else:
-                print("Invalid input. Please enter 1 or 2.")
-        if merge_method == 'merge' and numLayers == 2 and len(layersPath[0]) == len(layersPath[1]):
-            merge_layers(layersPath[0], all_filenames[0], layersPath[1], all_filenames[1], outputInput)
+                print("Invalid input. Please enter 1, 2 or 3.")
+        rules = None
+        if merge_method in ('combine', 'proof'):
+            rules_input = input("Enter the path to a combination rules JSON file, or press Enter to use every combination: ").strip()
+            if rules_input:
+                rules = CombinationRules.from_file(sanitize_path(rules_input), all_filenames)
+
+        if merge_method == 'proof':
+            generate_proof_sheets(layersPath, all_filenames, outputInput, rules=rules)
+            return
+
+        writers_input = input("Enter the number of background writer threads (press Enter to write inline; 2-4 helps on network drives): ").strip()
+        writer_threads = int(writers_input) if writers_input else 0
+
+        if merge_method == 'merge' and len({len(items) for items in layersPath}) == 1:
+            merge_layers(layersPath, all_filenames, outputInput, writer_threads)
         elif merge_method == 'combine':
-            generate_combinations(layersPath, all_filenames, outputInput)
+            default_workers = os.cpu_count() or 1
+            workers_input = input(f"Enter the number of worker processes (press Enter to use all {default_workers} cores): ").strip()
+            workers = int(workers_input) if workers_input else default_workers
+            shard_input = input("Enter the shard to render on this machine (e.g., 3/8), or press Enter to render all combinations: ").strip()
+            shard = parse_shard(shard_input) if shard_input else None
+            bundle_input = input("Enter the number of cards per bundle PDF, or press Enter to save one PDF per card: ").strip()
+            bundle_size = int(bundle_input) if bundle_input else 0
+            generate_combinations(layersPath, all_filenames, outputInput, workers, shard, bundle_size, writer_threads, rules)
         else:
             print("Invalid input or unequal number of files for merge operation.")
         print_concluding_message()
@@ -1,7 +1,12 @@
 import os
-import re
-from collections import defaultdict
-import shutil
+import sys
+import json
+import heapq
+from collections import defaultdict, Counter
+
+# The filename grammar is shared with parse_filenames.py in back-step3
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+from card_filenames import parse_card_filename, IDENTIFY_ORDER, RENAME_ORDER
 
 def print_welcome_message():
     welcome_text = """
@@ -17,6 +22,7 @@ def print_welcome_message():
     └──────────────────────────────────────────┘
     1. Rename newly generated files to the standard naming convention
     2. Fix number sequence of generated player card BACKS to match FRONTS
+    3. Resume or roll back a rename that was interrupted
 
     ┌──────────────────────────────────────────┐
     │           Before You Begin:              │
@@ -33,6 +39,8 @@ def print_welcome_message():
     ✦ This script will rename files directly. Ensure you have backups if needed.
     ✦ The script handles various naming patterns used in different card generations.
     ✦ For option 2, make sure you select the correct directories to avoid mistakes.
+    ✦ Every new name is worked out before any file is renamed. If a run is interrupted,
+      a .rename_journal.jsonl file is left behind so option 3 can finish or undo it.
 
     Let's begin organizing your AthletiFi card files!
     """
@@ -96,168 +104,378 @@ def sanitize_path(input_path):
         raise FileNotFoundError(f"Sanitized path is not a valid file or directory: {sanitized}")
 
 def get_file_info(filename):
-    patterns = [
-        # Pattern 1 and 2
-        re.compile(r'(Bronze|Silver) v2 - (.+?)_(CMYK|RGB)?_?(.+?)-(\d+)-with-text-layer_.+?_(\d+)\.pdf'),
-        # Pattern 3
-        re.compile(r'(Bronze|Silver) v2 - (.+?)_(CMYK|RGB)_(.+?)-(\d+)-with-text-layer_.+?vector border with bleed_(\d+)\.pdf'),
-        # Pattern 4
-        re.compile(
-            r'(?P<edition>Bronze v[12]|Silver v[12]|Galaxy|Dragon Purple|Dragon Red|Universe Nebula|Space) - '
-            r'(?P<background_name>[A-Za-z ]+)_'
-            r'(?P<player_name>.+?)-'
-            r'(?P<pose_number>\d+)-'
-            r'(?P<pose_type>running|shooting|standing)-pose-'
-            r'print-with-text-layer_NEW (rectangle )?'
-            r'(?P<border_style>v[12] [A-Za-z]+ Border)_vector border [a-z]+_'
-            r'(?P<edition_serial_number>\d+).pdf'
-        ),
-        # Pattern 5
-        re.compile(r'(.+?)[-_](\d+)[-_](Bronze|Silver|Galaxy|Dragon Purple|Dragon Red|Universe Nebula|Space)[-_](.+?)[-_](\d+)\.pdf', re.IGNORECASE),
-        # Pattern 6
-        re.compile(r'(Bronze|Silver) v2 - ([A-Za-z ]+)_(.+?)-(\d+)-with-text-layer_(\d+)\.pdf')
-    ]
-    
-    for pattern in patterns:
-        match = pattern.match(filename)
-        if match:
-            if isinstance(match.groups()[0], str):
-                return match.groups()
-            else:
-                return match.groupdict()
-    
-    return None
+    return parse_card_filename(filename, IDENTIFY_ORDER)
 
 def format_player_name(name):
     return name  # Keep the name as is, including spaces and hyphens
 
 def get_file_key(file_info):
-    if isinstance(file_info, tuple):
-        # For patterns 1, 2, 3, 5, 6
-        return f"{file_info[1]}_{file_info[-2]}"  # player_name_pose_number
-    elif isinstance(file_info, dict):
-        # For pattern 4
-        return f"{file_info['player_name']}_{file_info['pose_number']}"
-    else:
+    # Same key as the second and second-to-last regex groups the renamer has always used
+    if file_info is None:
         return None
+    if file_info.scheme == 'loose':
+        return f"{file_info.jersey_number}_{file_info.theme}"
+    if file_info.scheme == 'pose':
+        return f"{file_info.theme}_{file_info.border_style}"
+    return f"{file_info.theme}_{file_info.jersey_number}"
 
-def rename_new_files(directory):
-    pattern1 = re.compile(r'(Bronze|Silver) v2 - (.+?)_CMYK_(.+?)-(\d+)-with-text-layer_CMYK_.+?_(\d+)\.pdf')
-    pattern2 = re.compile(r'(Bronze|Silver) v2 - (.+?)_(.+?)-(\d+)-with-text-layer_digital vector border .+?_(\d+)_RGB\.pdf')
-    pattern3 = re.compile(r'(Bronze|Silver) v2 - (.+?)_(CMYK|RGB)_(.+?)-(\d+)-with-text-layer_.+?vector border with bleed_(\d+)\.pdf')
-    pattern4 = re.compile(
-        r'(?P<edition>Bronze v[12]|Silver v[12]|Galaxy|Dragon Purple|Dragon Red|Universe Nebula|Space) - '
-        r'(?P<background_name>[A-Za-z ]+)_'
-        r'(?P<player_name>.+?)-'
-        r'(?P<pose_number>\d+)-'
-        r'(?P<pose_type>running|shooting|standing)-pose-'
-        r'print-with-text-layer_NEW (rectangle )?'
-        r'(?P<border_style>v[12] [A-Za-z]+ Border)_vector border [a-z]+_'
-        r'(?P<edition_serial_number>\d+).pdf'
-    )
-    pattern5 = re.compile(r'(.+?)[-_](\d+)[-_](Bronze|Silver|Galaxy|Dragon Purple|Dragon Red|Universe Nebula|Space)[-_](.+?)[-_](\d+)\.pdf', re.IGNORECASE)
-    pattern6 = re.compile(r'(Bronze|Silver) v2 - ([A-Za-z ]+)_(.+?)-(\d+)-with-text-layer_(\d+)\.pdf')
+JOURNAL_FILENAME = ".rename_journal.jsonl"
+STAGING_PREFIX = ".renaming-"
+
+class RenameConflictError(Exception):
+    """Raised when a rename plan would overwrite a file, or the directory no longer matches a journal."""
+
+def scan_directory(directory, recursive=False):
+    """
+    List the files of a directory with os.scandir.
+    
+    Args:
+    directory (str): Directory to scan.
+    recursive (bool, optional): Also scan nested folders.
+    
+    Returns:
+    dict: Mapping of folder path relative to `directory` ('' for the directory itself) to a list of its filenames.
+    """
+    listing = {}
+    pending = ['']
+    while pending:
+        relative_dir = pending.pop()
+        names = listing[relative_dir] = []
+        with os.scandir(os.path.join(directory, relative_dir)) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(os.path.join(relative_dir, entry.name))
+                else:
+                    names.append(entry.name)
+    return listing
+
+def pdf_files(listing):
+    """Yield (relative folder, filename) for every PDF in a scan_directory listing, skipping staged files."""
+    for relative_dir, names in listing.items():
+        for filename in names:
+            if filename.lower().endswith('.pdf') and not filename.startswith(STAGING_PREFIX):
+                yield relative_dir, filename
+
+def plan_renames(listing, renames):
+    """
+    Order renames into steps that can be applied one at a time without overwriting anything.
+    
+    A rename whose target is still taken by another file being renamed (a chain or a cycle)
+    is staged: it first moves to a temporary name and reaches its target once every other
+    rename is done.
+    
+    Args:
+    listing (dict): scan_directory listing the renames apply to.
+    renames (list): (relative folder, old filename, new filename) tuples.
+    
+    Returns:
+    list: (relative folder, source, destination) steps in the order they must be applied.
+    
+    Raises:
+    RenameConflictError: If two files would get the same name, or a file would overwrite one that stays.
+    """
+    renames = [rename for rename in renames if rename[1] != rename[2]]
+    existing = {(relative_dir, filename) for relative_dir, names in listing.items() for filename in names}
+    sources = {(relative_dir, old) for relative_dir, old, _ in renames}
+    claims = defaultdict(list)
+    for relative_dir, old, new in renames:
+        claims[(relative_dir, new)].append(old)
+
+    conflicts = []
+    for (relative_dir, new), olds in claims.items():
+        if len(olds) > 1:
+            conflicts.append(f"{', '.join(sorted(olds))} would all be renamed to {new}")
+        elif (relative_dir, new) in existing and (relative_dir, new) not in sources:
+            conflicts.append(f"{olds[0]} would overwrite {new}, which is not being renamed")
+    if conflicts:
+        raise RenameConflictError("The rename plan has conflicts:\n  " + "\n  ".join(conflicts))
+
+    staged, direct, unstaged = [], [], []
+    for index, (relative_dir, old, new) in enumerate(renames):
+        if (relative_dir, new) in sources:
+            temporary = f"{STAGING_PREFIX}{index}-{old}"
+            staged.append((relative_dir, old, temporary))
+            unstaged.append((relative_dir, temporary, new))
+        else:
+            direct.append((relative_dir, old, new))
+    return staged + direct + unstaged
+
+class RenameJournal:
+    """
+    Write-ahead journal of a rename plan, kept as a JSON Lines file in the renamed directory.
+    
+    The first line holds the whole plan. Each applied step appends a 'done' record and each
+    rolled back step an 'undone' record, so an interrupted run can be resumed or rolled back
+    without scanning or parsing the files again. A partially written last line is ignored.
+    """
+    def __init__(self, directory, steps, renames, done=()):
+        self.directory = directory
+        self.path = os.path.join(directory, JOURNAL_FILENAME)
+        self.steps = steps
+        self.renames = renames
+        self.done = set(done)
+        self.file = None
+
+    @classmethod
+    def create(cls, directory, steps, renames):
+        journal = cls(directory, steps, renames)
+        journal.file = open(journal.path, 'x')
+        journal.file.write(json.dumps({'steps': steps, 'renames': renames}) + "\n")
+        journal.file.flush()
+        os.fsync(journal.file.fileno())
+        return journal
+
+    @classmethod
+    def load(cls, directory):
+        """Return the journal left in a directory by an interrupted run, or None."""
+        path = os.path.join(directory, JOURNAL_FILENAME)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as journal_file:
+            lines = journal_file.readlines()
+        plan = json.loads(lines[0])
+        done = set()
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if 'done' in record:
+                done.add(record['done'])
+            else:
+                done.discard(record['undone'])
+        journal = cls(directory, [tuple(step) for step in plan['steps']], [tuple(rename) for rename in plan['renames']], done)
+        journal.file = open(path, 'a')
+        return journal
+
+    def _path(self, relative_dir, filename):
+        return os.path.join(self.directory, relative_dir, filename)
+
+    def _record(self, key, index):
+        self.file.write(json.dumps({key: index}) + "\n")
+        self.file.flush()
+
+    def _move(self, index, source, destination, key):
+        relative_dir = self.steps[index][0]
+        source_path, destination_path = self._path(relative_dir, source), self._path(relative_dir, destination)
+        if os.path.exists(destination_path) or not os.path.exists(source_path):
+            # A crash between a rename and its journal record leaves exactly this state behind
+            if os.path.exists(destination_path) and not os.path.exists(source_path):
+                self._record(key, index)
+                return
+            raise RenameConflictError(f"Cannot rename {source_path} to {destination_path}: the directory has changed since the plan was made.")
+        os.rename(source_path, destination_path)
+        self._record(key, index)
+
+    def apply(self):
+        """Apply every step not applied yet, in plan order."""
+        for index, (_, source, destination) in enumerate(self.steps):
+            if index not in self.done:
+                self._move(index, source, destination, 'done')
+                self.done.add(index)
+
+    def roll_back(self):
+        """Undo every applied step, in reverse plan order."""
+        for index in reversed(range(len(self.steps))):
+            if index in self.done:
+                _, source, destination = self.steps[index]
+                self._move(index, destination, source, 'undone')
+                self.done.discard(index)
+
+    def finish(self):
+        """Close and remove the journal once the directory is in a consistent state."""
+        self.file.close()
+        os.remove(self.path)
+
+def check_no_journal(directory):
+    if os.path.exists(os.path.join(directory, JOURNAL_FILENAME)):
+        raise RenameConflictError(f"An interrupted rename was found in {directory}. Resume or roll it back first (option 3).")
+
+def apply_renames(directory, listing, renames):
+    """
+    Plan the renames, then apply them through a journal in the directory.
+    
+    Args:
+    directory (str): Directory the relative folders of `listing` and `renames` are in.
+    listing (dict): scan_directory listing of the directory.
+    renames (list): (relative folder, old filename, new filename) tuples.
+    """
+    steps = plan_renames(listing, renames)
+    if not steps:
+        print("Nothing to rename.")
+        return
+    changed = [(old, new) for _, old, new in renames if old != new]
+    staged = sum(1 for _, source, _ in steps if source.startswith(STAGING_PREFIX))
+    print(f"Planned {len(changed)} renames" + (f" ({staged} staged through temporary names)." if staged else "."))
+    journal = RenameJournal.create(directory, steps, changed)
+    journal.apply()
+    journal.finish()
+    print(f"Renamed {len(changed)} files.")
+
+def recover_renames(directory, action):
+    """
+    Resume or roll back the rename left unfinished in a directory.
+    
+    Args:
+    directory (str): Directory holding the rename journal.
+    action (str): 'resume' to finish the plan, 'rollback' to restore the original names.
+    
+    Returns:
+    bool: False if the directory has no unfinished rename.
+    """
+    journal = RenameJournal.load(directory)
+    if journal is None:
+        return False
+    print(f"Found an unfinished rename of {len(journal.renames)} files; {len(journal.done)} of {len(journal.steps)} steps were applied.")
+    if action == 'resume':
+        journal.apply()
+        print(f"Renamed {len(journal.renames)} files.")
+    else:
+        journal.roll_back()
+        print("Restored the original filenames.")
+    journal.finish()
+    return True
+
+MISMATCH_REPORT_FILENAME = "rename_mismatches.json"
+
+def key_trigrams(key):
+    """Return the set of lowercase character trigrams of a file key, padded so short keys still have some."""
+    padded = f"  {key.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class FuzzyKeyIndex:
+    """
+    Trigram inverted index over file keys, for finding the closest keys to one that has no exact match.
+    
+    The index is built once; a lookup only scores the keys that share at least one trigram with the
+    query, by the Jaccard similarity of their trigram sets.
+    
+    Args:
+    keys (iterable): The keys to index.
+    """
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.sizes = []
+        self.postings = defaultdict(list)
+        for key_id, key in enumerate(self.keys):
+            trigrams = key_trigrams(key)
+            self.sizes.append(len(trigrams))
+            for trigram in trigrams:
+                self.postings[trigram].append(key_id)
+
+    def closest(self, key, limit=3):
+        """
+        Return up to `limit` (key, similarity) pairs, most similar first; keys sharing no trigram are left out.
+        """
+        trigrams = key_trigrams(key)
+        shared = Counter()
+        for trigram in trigrams:
+            shared.update(self.postings.get(trigram, ()))
+        scored = ((count / (len(trigrams) + self.sizes[key_id] - count), self.keys[key_id]) for key_id, count in shared.items())
+        # Ties go to the alphabetically first key so reports are stable between runs
+        return [(candidate, round(score, 3)) for score, candidate in heapq.nsmallest(limit, scored, key=lambda item: (-item[0], item[1]))]
+
+def write_mismatch_report(directory, mismatches):
+    """Write the files that could not be matched, with their closest candidates, as JSON; returns the report path."""
+    report_path = os.path.join(directory, MISMATCH_REPORT_FILENAME)
+    with open(report_path, 'w') as report_file:
+        json.dump(mismatches, report_file, indent=2)
+    return report_path
 
+def rename_new_files(directory):
+    check_no_journal(directory)
     player_sequence = defaultdict(lambda: 1)
     serial_ids = defaultdict(int)
 
     # First pass: collect all files and sort them
-    all_files = []
-    for root, dirs, files in os.walk(directory):
-        for filename in files:
-            if filename.lower().endswith('.pdf'):
-                all_files.append((root, filename))
+    listing = scan_directory(directory, recursive=True)
+    all_files = list(pdf_files(listing))
     
     # Sort files by player name and original sequence number
     all_files.sort(key=lambda x: (x[1].split('_')[1], int(x[1].split('_')[-1].split('.')[0])))
 
-    # Second pass: rename files
-    for root, filename in all_files:
-        old_path = os.path.join(root, filename)
-        match1 = pattern1.match(filename)
-        match2 = pattern2.match(filename)
-        match3 = pattern3.match(filename)
-        match4 = pattern4.match(filename)
-        match5 = pattern5.match(filename)
-        match6 = pattern6.match(filename)
-
-        if match1:
-            edition, theme, name, player_number, serial_number = match1.groups()
-            new_filename = f"{format_player_name(name)}-{player_number}-{edition}-{theme}-{player_sequence[name]:02d}.pdf"
-            player_sequence[name] += 1
-        elif match2:
-            edition, theme, name, player_number, serial_number = match2.groups()
-            new_filename = f"{format_player_name(name)}-{player_number}-{edition}-{theme}-{player_sequence[name]:02d}.pdf"
-            player_sequence[name] += 1
-        elif match4:
-            data = match4.groupdict()
-            player_name = format_player_name(data['player_name'])
-            pose_type = data['pose_type']
-            edition = data['edition']
-            serial_ids[data['player_name']] += 1
-            new_filename = f"{player_name}_{serial_ids[data['player_name']]}_{pose_type}_{edition}_front.pdf"
-        elif match3:
-            edition, theme, color_profile, name, player_number, serial_number = match3.groups()
-            new_filename = f"{format_player_name(name)}-{player_number}-{edition}-{theme}-{player_sequence[name]:02d}.pdf"
-            player_sequence[name] += 1
-        elif match5:
-            name, number, edition, theme, sequence = match5.groups()
-            formatted_name = format_player_name(name)
-            new_filename = f"{formatted_name}-{number}-{edition}-{theme}-{player_sequence[name]:02d}.pdf"
-            player_sequence[name] += 1
-        elif match6:
-            edition, theme, name, player_number, serial_number = match6.groups()
-            new_filename = f"{format_player_name(name)}-{player_number}-{edition}-{theme}-{player_sequence[name]:02d}.pdf"
-            player_sequence[name] += 1
-        else:
+    # Second pass: work out the new names
+    renames = []
+    for relative_dir, filename in all_files:
+        file_info = parse_card_filename(filename, RENAME_ORDER)
+
+        if file_info is None:
             print(f"Skipping file with unrecognized pattern: {filename}")
             continue
+        elif file_info.scheme == 'pose':
+            player_name = format_player_name(file_info.player_name)
+            serial_ids[file_info.player_name] += 1
+            new_filename = f"{player_name}_{serial_ids[file_info.player_name]}_{file_info.pose_type}_{file_info.edition}_front.pdf"
+        else:
+            name = file_info.player_name
+            new_filename = f"{format_player_name(name)}-{file_info.jersey_number}-{file_info.edition}-{file_info.theme}-{player_sequence[name]:02d}.pdf"
+            player_sequence[name] += 1
 
-        new_path = os.path.join(root, new_filename)
-        os.rename(old_path, new_path)
-        print(f"Renamed PDF: {filename} -> {new_filename}")
+        renames.append((relative_dir, filename, new_filename))
+
+    # Third pass: apply the whole plan
+    apply_renames(directory, listing, renames)
 
 def fix_numbering(correct_dir, incorrect_dir):
+    check_no_journal(incorrect_dir)
     correct_files = defaultdict(list)
     incorrect_files = defaultdict(list)
 
     # Get the correct file names
-    for filename in os.listdir(correct_dir):
-        if filename.lower().endswith('.pdf'):
-            file_info = get_file_info(filename)
-            if file_info:
-                key = get_file_key(file_info)
-                correct_files[key].append((filename, file_info))
+    for _, filename in pdf_files(scan_directory(correct_dir)):
+        file_info = get_file_info(filename)
+        if file_info:
+            key = get_file_key(file_info)
+            correct_files[key].append((filename, file_info))
 
     # Get the incorrect file names
-    for filename in os.listdir(incorrect_dir):
-        if filename.lower().endswith('.pdf'):
-            file_info = get_file_info(filename)
-            if file_info:
-                key = get_file_key(file_info)
-                incorrect_files[key].append((filename, file_info))
+    listing = scan_directory(incorrect_dir)
+    for _, filename in pdf_files(listing):
+        file_info = get_file_info(filename)
+        if file_info:
+            key = get_file_key(file_info)
+            incorrect_files[key].append((filename, file_info))
 
     print(f"Found {len(correct_files)} unique correct file keys and {len(incorrect_files)} unique incorrect file keys.")
 
-    # Rename incorrect files
+    # Plan the renames of incorrect files
+    renames = []
+    mismatches = []
+    index = None
     for key in incorrect_files:
         if key in correct_files:
             for i, (incorrect_filename, incorrect_info) in enumerate(sorted(incorrect_files[key])):
                 if i < len(correct_files[key]):
                     correct_filename, correct_info = correct_files[key][i]
-                    old_path = os.path.join(incorrect_dir, incorrect_filename)
-                    new_path = os.path.join(incorrect_dir, correct_filename)
-                    shutil.move(old_path, new_path)
-                    print(f"Renamed: {incorrect_filename} -> {correct_filename}")
+                    renames.append(('', incorrect_filename, correct_filename))
                 else:
                     print(f"Warning: No matching correct file for {incorrect_filename}")
+                    mismatches.append({'reason': 'surplus', 'key': key, 'files': [incorrect_filename], 'candidates': []})
         else:
+            if index is None:
+                index = FuzzyKeyIndex(correct_files)
+            candidates = index.closest(key)
             print(f"Warning: No matching correct files for key {key}")
             print(f"  Incorrect file: {incorrect_files[key][0][0]}")
-            closest_match = min(correct_files.keys(), key=lambda x: len(set(x.split('_')) ^ set(key.split('_'))))
-            print(f"  Closest matching correct key: {closest_match}")
-            print(f"  Example correct file: {correct_files[closest_match][0][0]}")
-
+            if candidates:
+                closest_match = candidates[0][0]
+                print(f"  Closest matching correct keys: {', '.join(candidate for candidate, _ in candidates)}")
+                print(f"  Example correct file: {correct_files[closest_match][0][0]}")
+            mismatches.append({
+                'reason': 'no_matching_key',
+                'key': key,
+                'files': sorted(filename for filename, _ in incorrect_files[key]),
+                'candidates': [{'key': candidate, 'similarity': score, 'example_file': correct_files[candidate][0][0]}
+                               for candidate, score in candidates],
+            })
+
+    # Written on every run, empty when everything matched, so a report left from an earlier run never looks current
+    report_path = write_mismatch_report(incorrect_dir, mismatches)
+    if mismatches:
+        print(f"{len(mismatches)} mismatches were written to {report_path}")
+
+    apply_renames(incorrect_dir, listing, renames)
     print("File renaming completed.")
 
 def main():
@@ -268,9 +486,10 @@ def main():
 
     1. Rename newly generated files to the standard naming convention
     2. Fix number sequence of generated player card BACKS which do not match the sequence of the initial generation for FRONTs
+    3. Resume or roll back an interrupted rename
     """)
     
-    choice = input("Enter your choice (1 or 2): ")
+    choice = input("Enter your choice (1, 2 or 3): ")
 
     success = False
     try:
@@ -305,8 +524,26 @@ def main():
                 success = True
             except FileNotFoundError as e:
                 print(f"Error: {e}")
+        elif choice == '3':
+            print("\nFor finishing a rename that was interrupted:")
+            print("Requirements: The directory that was being renamed (for option 2, the directory of files to be RENAMED).")
+            directory = input("Enter the directory path: ")
+            try:
+                directory = sanitize_path(directory)
+                action = input("Type 'resume' to finish the rename or 'rollback' to restore the original names: ").strip().lower()
+                if action not in ('resume', 'rollback'):
+                    print("Invalid choice. Please run the script again and type 'resume' or 'rollback'.")
+                elif recover_renames(directory, action):
+                    success = True
+                else:
+                    print(f"No interrupted rename was found in {directory}.")
+            except FileNotFoundError as e:
+                print(f"Error: {e}")
         else:
-            print("Invalid choice. Please run the script again and select 1 or 2.")
+            print("Invalid choice. Please run the script again and select 1, 2 or 3.")
+    except RenameConflictError as e:
+        print(f"Error: {e}")
+        print("If files were already being renamed, the journal was kept so option 3 can resume or roll back the rename.")
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
 
@@ -0,0 +1,78 @@
+"""
+Benchmark the shared card filename grammar against the per-call regex scans it replaced.
+
+Usage:
+    python3 benchmark_card_filenames.py [count]
+
+Generates `count` synthetic filenames (1,000,000 by default) across every naming
+scheme, checks that the registry picks the same scheme as an in-order scan of
+every pattern, and prints the time taken by each approach. The baselines only
+find the matching scheme while the registry also builds the full record, so the
+reported speedup is conservative.
+"""
+import re
+import sys
+import time
+import random
+
+from card_filenames import SCHEMES, PARSE_ORDER, RENAME_ORDER, parse_card_filename
+
+FIRST_NAMES = ['John', 'Jane', 'Ann', 'Max', "D'Arcy", 'Lee Ann']
+LAST_NAMES = ['Doe', 'Roe', 'Lee', 'Poe', "O'Neil", 'Van Dyke']
+THEMES = ['Dark Blue', 'Red', 'Space', 'Green Glow']
+TEMPLATES = [
+    "{first}-{last}-{number}-{edition}-{theme}-{serial:02d}.pdf",
+    "{edition} v2 - {theme}_CMYK_{first}-{last}-{number}-with-text-layer_CMYK_v2 {edition} Border_{serial}.pdf",
+    "{edition} v2 - {theme}_{first}-{last}-{number}-with-text-layer_digital vector border {edition}_{serial}_RGB.pdf",
+    "{edition} v2 - {theme}_RGB_{first}-{last}-{number}-with-text-layer_digital vector border with bleed_{serial}.pdf",
+    "Galaxy - {theme}_{first}-{last}-{number}-running-pose-print-with-text-layer_NEW rectangle v2 {edition} Border_vector border print_{serial}.pdf",
+    "{first} {last}_{number}_galaxy_{theme}_{serial}.pdf",
+    "{edition} v2 - {theme}_{first}-{last}-{number}-with-text-layer_{serial}.pdf",
+    "{first}-{last}-headshot-{serial}.pdf",
+]
+
+def synthetic_filenames(count, seed=7):
+    rng = random.Random(seed)
+    return [rng.choice(TEMPLATES).format(first=rng.choice(FIRST_NAMES), last=rng.choice(LAST_NAMES),
+                                         number=rng.randint(1, 99), edition=rng.choice(('Bronze', 'Silver')),
+                                         theme=rng.choice(THEMES), serial=rng.randint(1, 500))
+            for _ in range(count)]
+
+def recompiling_scan(filename, order):
+    """The previous approach: build the pattern list on every call, then try each pattern in turn."""
+    patterns = [(name, re.compile(SCHEMES[name].pattern.pattern, SCHEMES[name].pattern.flags)) for name in order]
+    for name, pattern in patterns:
+        if pattern.match(filename):
+            return name
+    return None
+
+def eager_scan(filename, order):
+    """The previous rename approach: run every match up front, then take the first hit."""
+    matches = [(name, SCHEMES[name].pattern.match(filename)) for name in order]
+    return next((name for name, match in matches if match), None)
+
+def timed(label, function, filenames, order):
+    started = time.perf_counter()
+    results = [function(filename, order) for filename in filenames]
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<32} {elapsed:8.2f}s  ({len(filenames) / elapsed:,.0f} names/s)")
+    return results, elapsed
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    filenames = synthetic_filenames(count)
+    print(f"Parsing {count:,} synthetic card filenames...")
+
+    for label, order, baseline_label, baseline in (
+            ('parse_filenames.py order', PARSE_ORDER, 'recompile + in-order scan', recompiling_scan),
+            ('rename_files.py order', RENAME_ORDER, 'eager match of every pattern', eager_scan)):
+        print(f"\n{label}:")
+        expected, baseline_time = timed(baseline_label, baseline, filenames, order)
+        parsed, registry_time = timed('shared registry', parse_card_filename, filenames, order)
+        mismatches = sum(1 for scheme, record in zip(expected, parsed) if scheme != (record.scheme if record else None))
+        if mismatches:
+            raise SystemExit(f"  {mismatches} filenames were parsed with a different scheme than the in-order scan.")
+        print(f"  Same scheme as the in-order scan for all names; {baseline_time / registry_time:.1f}x faster.")
+
+if __name__ == "__main__":
+    main()
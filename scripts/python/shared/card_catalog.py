@@ -0,0 +1,250 @@
+"""
+Local SQLite catalog of cards, shared by every pipeline stage.
+
+Cards are scoped by collection: the same PDF filename in two collections is two
+separate cards. Each card is parsed from its filename once, the first time a
+stage sees it in its collection, and stored with its web image name and, later,
+its database details (image URL, dashboard slug and QR code). Later stages look
+cards up by any indexed field instead of rescanning directories or re-parsing
+filenames and CSV exports.
+"""
+import os
+import csv
+import sqlite3
+from datetime import datetime
+
+from card_filenames import parse_card_filename, webp_filename_for
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.card_catalog.sqlite3')
+CATALOG_EXTENSIONS = ('.sqlite3', '.sqlite', '.db')
+SCHEMA_VERSION = 2
+
+CARD_FIELDS = ('collection', 'pdf_filename', 'webp_filename', 'scheme', 'player_name', 'first_name', 'last_name',
+               'jersey_number', 'edition', 'theme', 'serial_number', 'color_profile', 'pose_type', 'border_style',
+               'stage', 'updated_at')
+DATABASE_FIELDS = ('card_image_url', 'dashboard_slug', 'qrcode_id')
+# Columns of the parsed_card_data.csv file that parse_filenames.py has always written
+PARSED_CSV_FIELDS = ('first_name', 'last_name', 'jersey_number', 'edition', 'theme', 'serial_number',
+                     'original_filename', 'webp_filename')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    collection TEXT NOT NULL,
+    pdf_filename TEXT NOT NULL,
+    webp_filename TEXT NOT NULL,
+    scheme TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    jersey_number TEXT NOT NULL,
+    edition TEXT NOT NULL,
+    theme TEXT NOT NULL,
+    serial_number TEXT NOT NULL,
+    color_profile TEXT NOT NULL DEFAULT '',
+    pose_type TEXT NOT NULL DEFAULT '',
+    border_style TEXT NOT NULL DEFAULT '',
+    card_image_url TEXT,
+    dashboard_slug TEXT,
+    qrcode_id TEXT,
+    stage TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (collection, pdf_filename)
+);
+CREATE INDEX IF NOT EXISTS cards_player ON cards (collection, first_name, last_name);
+CREATE INDEX IF NOT EXISTS cards_edition ON cards (collection, edition);
+CREATE INDEX IF NOT EXISTS cards_theme ON cards (collection, theme);
+CREATE INDEX IF NOT EXISTS cards_serial ON cards (collection, serial_number);
+CREATE INDEX IF NOT EXISTS cards_webp ON cards (collection, webp_filename);
+"""
+
+# Statements are fixed strings, so sqlite3 prepares each one once per connection and reuses it
+_UPSERT_CARD = (
+    f"INSERT INTO cards ({', '.join(CARD_FIELDS)}) VALUES ({', '.join('?' * len(CARD_FIELDS))}) "
+    "ON CONFLICT (collection, pdf_filename) DO UPDATE SET "
+    + ", ".join(f"{field} = excluded.{field}" for field in CARD_FIELDS[2:])
+)
+_UPDATE_DATABASE_FIELDS = (
+    "UPDATE cards SET card_image_url = COALESCE(?, card_image_url), dashboard_slug = COALESCE(?, dashboard_slug), "
+    "qrcode_id = COALESCE(?, qrcode_id), stage = ?, updated_at = ? "
+    "WHERE collection = ? AND webp_filename = ?"
+)
+_SELECT_PDF_BY_WEBP = "SELECT pdf_filename FROM cards WHERE collection = ? AND webp_filename = ?"
+
+def is_catalog_path(path):
+    return path.lower().endswith(CATALOG_EXTENSIONS)
+
+def parsed_csv_row(card):
+    """Return a catalog row in the parsed_card_data.csv layout."""
+    return {field: card['pdf_filename' if field == 'original_filename' else field] for field in PARSED_CSV_FIELDS}
+
+def load_parsed_cards(path, collection):
+    """
+    Load parsed card rows from either a catalog or a parsed_card_data.csv file.
+
+    From a catalog, only the collection's cards without database details yet are returned, i.e. the ones
+    still to be added. A CSV file holds a single collection already, so `collection` is not used for it.
+
+    Args:
+    path (str): Path of a catalog file or a parsed card CSV.
+    collection (str): Collection the cards are being added to.
+
+    Returns:
+    list: Dicts with the PARSED_CSV_FIELDS keys.
+    """
+    if is_catalog_path(path):
+        with CardCatalog(path) as catalog:
+            return [parsed_csv_row(card) for card in catalog.cards(collection, "card_image_url IS NULL")]
+    with open(path, 'r', newline='') as csvfile:
+        return list(csv.DictReader(csvfile))
+
+class CardCatalog:
+    """
+    Card catalog stored in a single SQLite file.
+
+    Args:
+    path (str, optional): Path of the catalog file; created on first use.
+    """
+    def __init__(self, path=DEFAULT_CATALOG_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self._upgrade()
+        self.connection.executescript(SCHEMA)
+
+    def _upgrade(self):
+        # Catalogs from before cards were scoped by collection are kept aside, not mixed into the new table
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            with self.connection:
+                if self.connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cards'").fetchone():
+                    self.connection.execute("DROP INDEX IF EXISTS cards_player")
+                    self.connection.execute("DROP INDEX IF EXISTS cards_edition")
+                    self.connection.execute("DROP INDEX IF EXISTS cards_theme")
+                    self.connection.execute("DROP INDEX IF EXISTS cards_serial")
+                    self.connection.execute("DROP INDEX IF EXISTS cards_webp")
+                    self.connection.execute(f"ALTER TABLE cards RENAME TO cards_unscoped_v{version}")
+                self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add_records(self, records, collection, stage):
+        """
+        Insert or update cards of a collection from parsed filename records in one transaction.
+
+        Args:
+        records (iterable): CardFilename records.
+        collection (str): Collection the cards belong to.
+        stage (str): Name of the stage adding the cards, kept for auditing.
+
+        Returns:
+        int: Number of cards written.
+        """
+        updated_at = datetime.now().isoformat(timespec='seconds')
+        rows = [(collection, record.filename, webp_filename_for(record.filename), record.scheme) + tuple(record[2:])
+                + (stage, updated_at) for record in records]
+        with self.connection:
+            self.connection.executemany(_UPSERT_CARD, rows)
+        return len(rows)
+
+    def add_filenames(self, filenames, collection, stage):
+        """
+        Catalog card filenames in a collection, parsing only the ones not cataloged in it yet.
+
+        Args:
+        filenames (iterable): Card PDF filenames.
+        collection (str): Collection the cards belong to.
+        stage (str): Name of the stage adding the cards.
+
+        Returns:
+        list: The filenames that match no known naming scheme.
+        """
+        filenames = list(dict.fromkeys(filenames))
+        known = self.known_filenames(collection, filenames)
+        records, unparsed = [], []
+        for filename in filenames:
+            if filename in known:
+                continue
+            record = parse_card_filename(filename)
+            if record is None:
+                unparsed.append(filename)
+            else:
+                records.append(record)
+        self.add_records(records, collection, stage)
+        return unparsed
+
+    def _load_lookup(self, filenames):
+        # A temporary table turns "which of these names" into one indexed join instead of a query per name
+        self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS lookup (pdf_filename TEXT PRIMARY KEY)")
+        self.connection.execute("DELETE FROM lookup")
+        self.connection.executemany("INSERT OR IGNORE INTO lookup VALUES (?)", ((name,) for name in filenames))
+
+    def known_filenames(self, collection, filenames):
+        """Return the subset of the given PDF filenames that are already cataloged in a collection."""
+        with self.connection:
+            self._load_lookup(filenames)
+            rows = self.connection.execute(
+                "SELECT pdf_filename FROM cards JOIN lookup USING (pdf_filename) WHERE collection = ?", (collection,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def cards_for_filenames(self, collection, filenames):
+        """Return a collection's rows for the given PDF filenames as dicts, in the given order; unknown names are left out."""
+        with self.connection:
+            self._load_lookup(filenames)
+            rows = self.connection.execute(
+                "SELECT cards.* FROM cards JOIN lookup USING (pdf_filename) WHERE collection = ?", (collection,)
+            ).fetchall()
+        by_filename = {row['pdf_filename']: dict(row) for row in rows}
+        return [by_filename[name] for name in dict.fromkeys(filenames) if name in by_filename]
+
+    def pdf_filename_for_webp(self, collection, webp_filename):
+        """Return the PDF filename a web image in a collection was made from, or None."""
+        row = self.connection.execute(_SELECT_PDF_BY_WEBP, (collection, webp_filename)).fetchone()
+        return row[0] if row else None
+
+    def cards(self, collection, where="", parameters=()):
+        """
+        Return a collection's cataloged cards as dicts, optionally filtered.
+
+        Args:
+        collection (str): Collection to list.
+        where (str, optional): SQL condition on the cards table, e.g. "edition = ?".
+        parameters (tuple, optional): Values for the condition's placeholders.
+        """
+        query = "SELECT * FROM cards WHERE collection = ?" + (f" AND ({where})" if where else "") + " ORDER BY pdf_filename"
+        return [dict(row) for row in self.connection.execute(query, (collection,) + tuple(parameters))]
+
+    def write_parsed_csv(self, path, collection, filenames):
+        """Write a collection's cataloged cards for the given PDF filenames to a parsed_card_data.csv file."""
+        with open(path, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=PARSED_CSV_FIELDS)
+            writer.writeheader()
+            for card in self.cards_for_filenames(collection, filenames):
+                writer.writerow(parsed_csv_row(card))
+
+    def record_database_fields(self, collection, rows, stage):
+        """
+        Store database details for cards of a collection, matched by web image filename, in one transaction.
+
+        Args:
+        collection (str): Collection the cards belong to.
+        rows (iterable): Dicts with 'webp_filename' and any of the DATABASE_FIELDS; missing values are kept.
+        stage (str): Name of the stage recording the details.
+
+        Returns:
+        int: Number of cards updated.
+        """
+        updated_at = datetime.now().isoformat(timespec='seconds')
+        parameters = [tuple(row.get(field) for field in DATABASE_FIELDS) + (stage, updated_at, collection, row['webp_filename'])
+                      for row in rows]
+        with self.connection:
+            cursor = self.connection.executemany(_UPDATE_DATABASE_FIELDS, parameters)
+        return cursor.rowcount
@@ -0,0 +1,173 @@
+"""
+Shared grammar for AthletiFi card filenames.
+
+Every naming scheme used across card generations is compiled once, at import.
+Each scheme has a cheap literal check that any matching filename must pass, so
+a parse usually attempts a single regex instead of trying every pattern in turn.
+The checks never reject a filename its pattern would accept, so the first
+matching scheme is the same one a plain in-order scan would find.
+"""
+import re
+from typing import NamedTuple
+
+EDITIONS = ('Bronze', 'Silver', 'Galaxy', 'Dragon Purple', 'Dragon Red', 'Universe Nebula', 'Space')
+OLD_PREFIXES = ('Bronze v2 - ', 'Silver v2 - ')
+TEXT_LAYER_MARKER = '-with-text-layer_'
+_SERIAL_TAIL = re.compile(r'_\d+\.pdf')
+_PLAIN_TEXT_LAYER_TAIL = re.compile(r'-with-text-layer_\d+\.pdf')
+_LOOSE_CORE = re.compile(r'[-_]\d+[-_](?:Bronze|Silver|Galaxy|Dragon Purple|Dragon Red|Universe Nebula|Space)[-_]', re.IGNORECASE)
+
+class CardFilename(NamedTuple):
+    """The fields parsed from a card filename; fields a scheme does not carry are empty strings."""
+    scheme: str
+    filename: str
+    player_name: str
+    first_name: str
+    last_name: str
+    jersey_number: str
+    edition: str
+    theme: str
+    serial_number: str
+    color_profile: str = ''
+    pose_type: str = ''
+    border_style: str = ''
+
+class NamingScheme(NamedTuple):
+    name: str
+    pattern: re.Pattern
+    precheck: object  # Callable taking the filename; False means the pattern cannot match
+    build: object  # Callable taking the filename and match, returning a CardFilename
+
+def _old_prefix(filename):
+    return filename.startswith(OLD_PREFIXES)
+
+def _text_layer_precheck(filename):
+    # The text layer marker must be followed by at least one character and then _<serial>.pdf
+    if not _old_prefix(filename):
+        return False
+    marker = filename.find(TEXT_LAYER_MARKER)
+    return marker >= 0 and _SERIAL_TAIL.search(filename, marker + len(TEXT_LAYER_MARKER) + 1) is not None
+
+def _record_builder(scheme, player, number, edition, theme, serial, profile=None, pose=None, border=None, default_profile=''):
+    """
+    Return a function that builds a CardFilename from a match, given the group number of each field.
+    
+    Fields without a group number are left empty (or `default_profile` for the colour profile).
+    The player name is split into first and last name at its first hyphen.
+    """
+    def build(filename, match):
+        groups = match.groups('')
+        player_name = groups[player]
+        first_name, _, last_name = player_name.partition('-')
+        return CardFilename(scheme, filename, player_name, first_name, last_name, groups[number], groups[edition],
+                            groups[theme], groups[serial], default_profile if profile is None else groups[profile],
+                            '' if pose is None else groups[pose], '' if border is None else groups[border])
+    return build
+
+def _new_record(filename, match):
+    first_name, last_name, jersey_number, edition, theme, serial_number = match.groups()
+    return CardFilename('new', filename, f"{first_name}-{last_name}", first_name, last_name,
+                        jersey_number, edition, theme, serial_number)
+
+SCHEMES = {scheme.name: scheme for scheme in (
+    # Current scheme: First-Last-Number-Edition-Theme-Serial.pdf
+    NamingScheme(
+        'new',
+        re.compile(r"([A-Za-z' ]+)-([A-Za-z' ]+)-(\d+)-(Bronze|Silver)-(.+?)-(\d+)\.pdf"),
+        lambda filename: '-Bronze-' in filename or '-Silver-' in filename,
+        _new_record,
+    ),
+    # Raw merge output, print (CMYK) borders
+    NamingScheme(
+        'cmyk',
+        re.compile(r'(Bronze|Silver) v2 - (.+?)_CMYK_(.+?)-(\d+)-with-text-layer_CMYK_.+?_(\d+)\.pdf'),
+        lambda filename: _old_prefix(filename) and '-with-text-layer_CMYK_' in filename,
+        _record_builder('cmyk', player=2, number=3, edition=0, theme=1, serial=4, default_profile='CMYK'),
+    ),
+    # Raw merge output, digital (RGB) borders
+    NamingScheme(
+        'digital',
+        re.compile(r'(Bronze|Silver) v2 - (.+?)_(.+?)-(\d+)-with-text-layer_digital vector border .+?_(\d+)_RGB\.pdf'),
+        lambda filename: _old_prefix(filename) and '-with-text-layer_digital vector border ' in filename,
+        _record_builder('digital', player=2, number=3, edition=0, theme=1, serial=4, default_profile='RGB'),
+    ),
+    # Old generic text-layer output, with an optional colour profile
+    NamingScheme(
+        'text_layer',
+        re.compile(r'(Bronze|Silver) v2 - (.+?)_(CMYK|RGB)?_?(.+?)-(\d+)-with-text-layer_.+?_(\d+)\.pdf'),
+        _text_layer_precheck,
+        _record_builder('text_layer', player=3, number=4, edition=0, theme=1, serial=5, profile=2),
+    ),
+    # Old output with bleed borders
+    NamingScheme(
+        'bleed',
+        re.compile(r'(Bronze|Silver) v2 - (.+?)_(CMYK|RGB)_(.+?)-(\d+)-with-text-layer_.+?vector border with bleed_(\d+)\.pdf'),
+        lambda filename: _old_prefix(filename) and 'vector border with bleed_' in filename,
+        _record_builder('bleed', player=3, number=4, edition=0, theme=1, serial=5, profile=2),
+    ),
+    # Posed player photos on named editions
+    NamingScheme(
+        'pose',
+        re.compile(
+            r'(?P<edition>Bronze v[12]|Silver v[12]|Galaxy|Dragon Purple|Dragon Red|Universe Nebula|Space) - '
+            r'(?P<background_name>[A-Za-z ]+)_'
+            r'(?P<player_name>.+?)-'
+            r'(?P<pose_number>\d+)-'
+            r'(?P<pose_type>running|shooting|standing)-pose-'
+            r'print-with-text-layer_NEW (rectangle )?'
+            r'(?P<border_style>v[12] [A-Za-z]+ Border)_vector border [a-z]+_'
+            r'(?P<edition_serial_number>\d+).pdf'
+        ),
+        lambda filename: '-pose-print-with-text-layer_NEW ' in filename,
+        _record_builder('pose', player=2, number=3, edition=0, theme=1, serial=7, pose=4, border=6),
+    ),
+    # Loosely separated Name-Number-Edition-Theme-Serial, any case
+    NamingScheme(
+        'loose',
+        re.compile(r'(.+?)[-_](\d+)[-_](Bronze|Silver|Galaxy|Dragon Purple|Dragon Red|Universe Nebula|Space)[-_](.+?)[-_](\d+)\.pdf', re.IGNORECASE),
+        lambda filename: _LOOSE_CORE.search(filename) is not None,
+        _record_builder('loose', player=0, number=1, edition=2, theme=3, serial=4),
+    ),
+    # Old text-layer output without a border
+    NamingScheme(
+        'text_layer_plain',
+        re.compile(r'(Bronze|Silver) v2 - ([A-Za-z ]+)_(.+?)-(\d+)-with-text-layer_(\d+)\.pdf'),
+        lambda filename: _old_prefix(filename) and _PLAIN_TEXT_LAYER_TAIL.search(filename) is not None,
+        _record_builder('text_layer_plain', player=2, number=3, edition=0, theme=1, serial=4),
+    ),
+)}
+
+# Scheme orders used by the scripts; earlier schemes win when several match
+PARSE_ORDER = ('new', 'text_layer', 'bleed', 'pose', 'loose', 'text_layer_plain')
+IDENTIFY_ORDER = ('text_layer', 'bleed', 'pose', 'loose', 'text_layer_plain')
+RENAME_ORDER = ('cmyk', 'digital', 'pose', 'bleed', 'loose', 'text_layer_plain')
+
+_ORDERS = {}
+
+def _ordered_schemes(order):
+    schemes = _ORDERS.get(order)
+    if schemes is None:
+        schemes = _ORDERS[order] = tuple(SCHEMES[name] for name in order)
+    return schemes
+
+def parse_card_filename(filename, order=PARSE_ORDER):
+    """
+    Parse a card filename with the first matching naming scheme.
+    
+    Args:
+    filename (str): The filename to parse.
+    order (tuple, optional): Names of the schemes to try, in priority order.
+    
+    Returns:
+    CardFilename or None: The parsed fields, or None if no scheme matches.
+    """
+    for scheme in _ordered_schemes(order):
+        if scheme.precheck(filename):
+            match = scheme.pattern.match(filename)
+            if match:
+                return scheme.build(filename, match)
+    return None
+
+def webp_filename_for(filename):
+    """Return the web image filename for a card PDF: .webp extension, spaces replaced by hyphens."""
+    return (filename.rsplit('.', 1)[0] + '.webp').replace(' ', '-')
@@ -0,0 +1,55 @@
+-- Per-collection dashboard slug counters for generate_athletifi_db_queries.py.
+--
+-- Each collection has a row holding the highest dashboard slug number reserved or used in it.
+-- The query generator reserves a block of slugs with a single upsert on this table, so it never
+-- scans player_card_images for the highest slug. Slugs inserted without a reservation (by hand or
+-- by older scripts) still move the counter forward through the triggers below, so it cannot fall
+-- behind the slugs in use.
+--
+-- Run once per database, e.g. in pgAdmin's query tool or with
+--     psql "$ATHLETIFI_DATABASE_URL" -f scripts/sql/migrations/001_collection_slug_counters.sql
+-- Running it again is harmless.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.collection_slug_counters (
+    collection TEXT PRIMARY KEY,
+    last_slug INTEGER NOT NULL
+);
+
+-- Slugs take the form '<collection>/<number>'
+CREATE OR REPLACE FUNCTION public.advance_collection_slug_counters() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO public.collection_slug_counters AS counters (collection, last_slug)
+    SELECT SUBSTRING(dashboard_slug FROM '^(.*)/[0-9]+$'), MAX(CAST(SUBSTRING(dashboard_slug FROM '/([0-9]+)$') AS INTEGER))
+    FROM new_card_images
+    WHERE dashboard_slug ~ '^.+/[0-9]+$'
+    GROUP BY 1
+    ON CONFLICT (collection) DO UPDATE SET last_slug = EXCLUDED.last_slug
+    WHERE counters.last_slug < EXCLUDED.last_slug;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+-- Statement-level, so a bulk insert touches each collection's counter once rather than once per card
+DROP TRIGGER IF EXISTS advance_collection_slug_counters_on_insert ON public.player_card_images;
+CREATE TRIGGER advance_collection_slug_counters_on_insert
+    AFTER INSERT ON public.player_card_images
+    REFERENCING NEW TABLE AS new_card_images
+    FOR EACH STATEMENT EXECUTE FUNCTION public.advance_collection_slug_counters();
+
+DROP TRIGGER IF EXISTS advance_collection_slug_counters_on_update ON public.player_card_images;
+CREATE TRIGGER advance_collection_slug_counters_on_update
+    AFTER UPDATE ON public.player_card_images
+    REFERENCING NEW TABLE AS new_card_images
+    FOR EACH STATEMENT EXECUTE FUNCTION public.advance_collection_slug_counters();
+
+-- Seed the counters from the slugs already in use; creating the triggers above holds off inserts until COMMIT
+INSERT INTO public.collection_slug_counters AS counters (collection, last_slug)
+SELECT SUBSTRING(dashboard_slug FROM '^(.*)/[0-9]+$'), MAX(CAST(SUBSTRING(dashboard_slug FROM '/([0-9]+)$') AS INTEGER))
+FROM public.player_card_images
+WHERE dashboard_slug ~ '^.+/[0-9]+$'
+GROUP BY 1
+ON CONFLICT (collection) DO UPDATE SET last_slug = EXCLUDED.last_slug
+WHERE counters.last_slug < EXCLUDED.last_slug;
+
+COMMIT;
@@ -0,0 +1,27 @@
+-- Indexes for the player name joins in generate_athletifi_db_queries.py.
+--
+-- The queries join player_identities against a list of (first name, last name) pairs, column by
+-- column, instead of comparing a concatenated full name, so these indexes can serve them:
+--   * player_identities_name: the exact matches of the player, card image, invitation and QR
+--     redirect statements;
+--   * player_identities_name_lower: the case-insensitive matches of the existing player and QR code
+--     checks, which ignore spaces before the first name and after the last name, like the
+--     LOWER(TRIM(first || ' ' || last)) comparison they replace;
+--   * players_team_info_identity: the lookup of a player's team records.
+--
+-- Run once per database, e.g. in pgAdmin's query tool or with
+--     psql "$ATHLETIFI_DATABASE_URL" -f scripts/sql/migrations/002_player_name_indexes.sql
+-- Running it again is harmless.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS player_identities_name
+    ON public.player_identities (player_first_name, player_last_name);
+
+CREATE INDEX IF NOT EXISTS player_identities_name_lower
+    ON public.player_identities (LOWER(LTRIM(player_first_name)), LOWER(RTRIM(player_last_name)));
+
+CREATE INDEX IF NOT EXISTS players_team_info_identity
+    ON public.players_team_info (player_identity);
+
+COMMIT;